@@ -11,6 +11,8 @@ if sys.platform == 'win32':
     sys.stderr.reconfigure(encoding='utf-8', errors='replace')
 
 import asyncio
+import logging
+import traceback
 from dataclasses import dataclass
 from typing import Optional, Any
 
@@ -38,6 +40,8 @@ from config import (
 
 __all__ = ['AppContext', 'create_app', 'get_app']
 
+logger = logging.getLogger(__name__)
+
 
 # ---------------------------------------------------------------------------
 # Application context
@@ -99,21 +103,21 @@ def create_app(
             ttl_seconds=SEMANTIC_CACHE_TTL,
             max_size=SEMANTIC_CACHE_MAX_SIZE,
         )
-        print("Semantic cache initialized")
+        logger.info("Semantic cache initialized")
 
     # Checkpointer (in-memory; swap to SqliteSaver for cross-restart persistence)
     checkpointer = None
     try:
         from langgraph.checkpoint.memory import InMemorySaver
         checkpointer = InMemorySaver()
-        print("  Checkpointer: InMemorySaver (in-memory)")
+        logger.info("Checkpointer: InMemorySaver (in-memory)")
     except ImportError:
         try:
             from langgraph.checkpoint.memory import MemorySaver
             checkpointer = MemorySaver()
-            print("  Checkpointer: MemorySaver (in-memory)")
+            logger.info("Checkpointer: MemorySaver (in-memory)")
         except Exception as e:
-            print(f"  Checkpointer disabled: {e}")
+            logger.warning(f"Checkpointer disabled: {e}")
 
     # MCP-only: the LangGraph pipeline is built later, in the API lifespan
     # (api.py) or the CLI below, AFTER the MCP tool sessions are open — it needs
@@ -208,7 +212,6 @@ async def _cli_main() -> None:
                     print(f"\nAssistant: {response}\n")
                 except Exception as e:
                     print(f"Error: {e}")
-                    import traceback
                     traceback.print_exc()
         finally:
             ctx.neo4j_graph.close()
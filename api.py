@@ -16,33 +16,116 @@ import asyncio
 try:
     import uvloop  # type: ignore
     asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    _HAS_UVLOOP = True
 except ImportError:
-    pass
+    _HAS_UVLOOP = False
 
 from contextlib import asynccontextmanager
+from contextvars import ContextVar
 from fastapi import BackgroundTasks, Depends, FastAPI, Header, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
-from fastapi.responses import FileResponse, HTMLResponse, StreamingResponse
+from fastapi.responses import HTMLResponse, JSONResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel, Field
 from typing import Optional, Dict
-from collections import defaultdict, deque
+from collections import OrderedDict, defaultdict, deque
+import atexit
+import functools
+import hashlib
 import json
 import logging
+import logging.handlers
 import os
+import queue
 import re
 import secrets
 import threading
 import time
+import uuid
+
+# orjson serialises several times faster than the stdlib encoder; used for
+# every JSON endpoint and every SSE frame, and to decode tool results for
+# cards. Falls back to json if missing.
+# SSE frames are built as UTF-8 bytes (orjson's native output) so they go to
+# the socket without a decode to str and a re-encode by StreamingResponse.
+try:
+    import orjson
+    from fastapi.responses import ORJSONResponse as _JSONResponse
+
+    _dumpb = orjson.dumps
+    _loads = orjson.loads
+
+    def _dumpb_sorted(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+except ImportError:  # pragma: no cover
+    _JSONResponse = JSONResponse
+    _loads = json.loads
+
+    def _dumpb(obj) -> bytes:
+        return json.dumps(obj).encode()
+
+    def _dumpb_sorted(obj) -> bytes:
+        return json.dumps(obj, sort_keys=True).encode()
+
+
+def _sse(obj) -> bytes:
+    return b"data: " + _dumpb(obj) + b"\n\n"
+
+
+def _sse_heartbeat() -> bytes:
+    return b"event: heartbeat\ndata: " + _dumpb({"ts": int(time.time())}) + b"\n\n"
+
 
 from APP import get_app
 from models import Coordinates
 from config import REDIS_URL, AGENT_TIMEOUT
 from clients.ors_client import decode_geometry
+from graph.agent import TIMEOUT_REPLY, _format_history, _format_location
+from graph.nodes.proactive_node import create_proactive_node
 from langchain_core.messages import AIMessage, AIMessageChunk, HumanMessage
 
-logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+# Content-Encoding: identity opts SSE responses OUT of GZipMiddleware, which
+# otherwise buffers the whole stream in its gzip compressor and only flushes
+# at the end (Starlette's GZipResponder never flushes per chunk) — that
+# defeats token streaming entirely. X-Accel-Buffering disables proxy
+# buffering (nginx/traefik).
+_SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",
+    "Content-Encoding": "identity",
+}
+
+# SSE frames whose payload never varies, serialised once at import.
+_SSE_STREAM_ERROR = _sse({"type": "error", "content": "stream error"})
+_SSE_TIMEOUT_REPLY = _sse({"type": "token", "content": TIMEOUT_REPLY})
+
+# Request handlers only enqueue log records; a QueueListener thread does
+# the (possibly slow — docker/journald) stream write, so concurrent sessions
+# never serialize on the stdout lock.
+# The session a log line belongs to comes from a task-local ContextVar, not a
+# module global, so concurrent /chat requests can't mis-attribute each other's
+# lines. asyncio tasks and to_thread workers inherit the caller's context.
+_current_session_id: ContextVar[str] = ContextVar("session_id", default="-")
+
+
+class _SessionLogFilter(logging.Filter):
+    def filter(self, record):
+        record.session_id = _current_session_id.get()
+        return True
+
+
+_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+_log_stream_handler = logging.StreamHandler()
+_log_stream_handler.setFormatter(
+    logging.Formatter("%(asctime)s [%(levelname)s] %(name)s [%(session_id)s]: %(message)s")
+)
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_stream_handler)
+_log_queue_handler = logging.handlers.QueueHandler(_log_queue)
+_log_queue_handler.addFilter(_SessionLogFilter())
+logging.basicConfig(level=logging.INFO, handlers=[_log_queue_handler])
+_log_listener.start()
+atexit.register(_log_listener.stop)  # flush queued records on shutdown
 logger = logging.getLogger("magdeburg_api")
 
 logger.info("Starting Magdeburg Assistant API v6.0 (LangGraph single-agent on MCP tools)...")
@@ -55,28 +138,51 @@ ctx = get_app()
 # Session state
 # ---------------------------------------------------------------------------
 SESSION_TIMEOUT_SECONDS = 1800  # 30 minutes
-_session_last_active: Dict[str, float] = {}
-_session_histories: Dict[str, list] = {}
+MAX_SESSIONS = 10_000
+# Kept in least-recently-active order (touch moves a session to the end), so
+# expiry pops from the front and the size cap evicts the stalest session.
+_session_last_active: "OrderedDict[str, float]" = OrderedDict()
+# defaultdict: _add_to_history creates a session's list on first write. Reads
+# go through .get() so they never materialise empty entries.
+_session_histories: Dict[str, list] = defaultdict(list)
 _session_tokens: Dict[str, str] = {}
 _session_active_lock = threading.Lock()
 
 
+def _drop_session_locked(session_id: str) -> None:
+    # Caller holds _session_active_lock.
+    _session_last_active.pop(session_id, None)
+    _session_histories.pop(session_id, None)
+    _session_tokens.pop(session_id, None)
+
+
+def _mark_active_locked(session_id: str) -> None:
+    # Caller holds _session_active_lock.
+    _session_last_active[session_id] = time.time()
+    _session_last_active.move_to_end(session_id)
+    # Abandoned widgets never call /session/end; cap the store so they can't
+    # grow it between cleanup passes.
+    while len(_session_last_active) > MAX_SESSIONS:
+        _drop_session_locked(next(iter(_session_last_active)))
+
+
 def _touch_session(session_id: str) -> None:
     with _session_active_lock:
-        _session_last_active[session_id] = time.time()
+        _mark_active_locked(session_id)
 
 
 def _auto_cleanup_sessions() -> None:
-    now = time.time()
+    cutoff = time.time() - SESSION_TIMEOUT_SECONDS
+    expired = []
     with _session_active_lock:
-        expired = [
-            sid for sid, last in _session_last_active.items()
-            if now - last > SESSION_TIMEOUT_SECONDS
-        ]
+        # Oldest first: stop at the first session that is still live instead
+        # of scanning every session on each pass.
+        for sid, last in _session_last_active.items():
+            if last > cutoff:
+                break
+            expired.append(sid)
         for sid in expired:
-            _session_last_active.pop(sid, None)
-            _session_histories.pop(sid, None)
-            _session_tokens.pop(sid, None)
+            _drop_session_locked(sid)
     if expired:
         logger.info(f"Auto-cleaned {len(expired)} expired session(s)")
 
@@ -108,8 +214,11 @@ async def _cleanup_loop():
             logger.exception("cleanup loop iteration failed")
 
 
-def _get_conversation_history(session_id: str) -> list:
+def _begin_turn(session_id: str) -> list:
+    """Mark the session active and return a snapshot of its conversation
+    history, under one lock acquisition."""
     with _session_active_lock:
+        _mark_active_locked(session_id)
         return list(_session_histories.get(session_id, []))
 
 
@@ -123,8 +232,12 @@ def _add_to_history(session_id: str, query: str, response: str) -> None:
     safe_query = _redact_pii(query)
     safe_response = _redact_pii(response)
     with _session_active_lock:
-        if session_id not in _session_histories:
-            _session_histories[session_id] = []
+        # A late write for a session already evicted (LRU cap or idle
+        # cleanup) would recreate its defaultdict entry outside the LRU
+        # order, where nothing ever drops it again.
+        if session_id not in _session_last_active:
+            logger.debug(f"[SESSION] history write for untracked session {session_id} dropped")
+            return
         history = _session_histories[session_id]
         history.append({"role": "user", "content": safe_query})
         history.append({"role": "assistant", "content": safe_response})
@@ -245,6 +358,8 @@ _STREET_RE = re.compile(
     r'\b[A-ZÄÖÜ][A-Za-zäöüß\-]{3,}(?:strasse|straße|str\.|platz|weg|allee|ring|gasse)\s+\d{1,4}[a-zA-Z]?\b',
     re.IGNORECASE,
 )
+# Every pattern above needs an '@' or a digit; most chat turns have neither.
+_DIGIT_RE = re.compile(r'\d')
 
 
 def _redact_pii(text: str) -> str:
@@ -256,9 +371,14 @@ def _redact_pii(text: str) -> str:
     """
     if not text:
         return text
-    redacted = _EMAIL_RE.sub("<email>", text)
-    redacted = _PHONE_RE.sub("<phone>", redacted)
-    redacted = _STREET_RE.sub("<address>", redacted)
+    has_at = "@" in text
+    has_digit = _DIGIT_RE.search(text) is not None
+    if not (has_at or has_digit):
+        return text
+    redacted = _EMAIL_RE.sub("<email>", text) if has_at else text
+    if has_digit:
+        redacted = _PHONE_RE.sub("<phone>", redacted)
+        redacted = _STREET_RE.sub("<address>", redacted)
     return redacted
 
 
@@ -269,6 +389,20 @@ _here = os.path.dirname(os.path.abspath(__file__))
 _static_dir = os.path.join(_here, "static")
 _templates_dir = os.path.join(_here, "templates")
 
+
+def _load_index_html():
+    """Read the chat UI once at import (no per-request disk I/O on the event
+    loop). Returns (bytes, etag) or (None, None) when no UI is installed."""
+    index_path = os.path.join(_templates_dir, "index.html")
+    if not os.path.isfile(index_path):
+        return None, None
+    with open(index_path, "rb") as f:
+        body = f.read()
+    return body, '"' + hashlib.md5(body).hexdigest() + '"'
+
+
+_INDEX_HTML, _INDEX_ETAG = _load_index_html()
+
 _cleanup_task = None
 _mcp_stack = None  # AsyncExitStack holding the persistent MCP sessions (opened in lifespan)
 
@@ -277,34 +411,48 @@ _mcp_stack = None  # AsyncExitStack holding the persistent MCP sessions (opened
 async def lifespan(app: FastAPI):
     global _cleanup_task, _mcp_stack
     _cleanup_task = asyncio.create_task(_cleanup_loop())
+    # Warm the in-memory stop coordinate arrays (nearest-stop lookups) in a
+    # worker thread WHILE the MCP servers boot, so the first located user
+    # doesn't pay the one-time Stop load on their request.
+    stop_warmup = asyncio.create_task(asyncio.to_thread(ctx.neo4j_graph.warm_stop_coords))
 
-    # MCP is the ONLY tool path (no in-process fallback). Open persistent stdio
-    # sessions to the 4 MCP servers and build the single gpt-5.4 agent on them.
-    # If this fails, the app fails to start — by design.
-    from contextlib import AsyncExitStack
-    from graph.mcp_client import open_mcp_tools
-    from graph.graph import build_graph
-
-    from graph.agent import build_single_agent
-
-    _mcp_stack = AsyncExitStack()
-    await _mcp_stack.__aenter__()
-    tools, per_server = await open_mcp_tools(_mcp_stack)
-    # Build the agent ONCE and keep a handle on it: the /chat streaming path
-    # streams this agent directly (token-by-token), and the graph wraps the
-    # SAME agent for the non-streaming path.
-    agent, _tool_names = build_single_agent(tools)
-    ctx.single_agent = agent
-    ctx.graph_app = build_graph(
-        neo4j_graph=ctx.neo4j_graph,
-        fiware_client=ctx.fiware_client,
-        ors_client=ctx.ors_client,
-        semantic_cache=ctx.semantic_cache,
-        checkpointer=ctx.checkpointer,
-        tools=tools,
-        agent=agent,
-    )
-    logger.info(f"[MCP] single gpt-5.4 agent ready on {len(tools)} MCP tools: {per_server}")
+    try:
+        # MCP is the ONLY tool path (no in-process fallback). Open persistent stdio
+        # sessions to the 4 MCP servers and build the single gpt-5.4 agent on them.
+        # If this fails, the app fails to start — by design.
+        from contextlib import AsyncExitStack
+        from graph.mcp_client import open_mcp_tools
+        from graph.graph import build_graph
+
+        from graph.agent import build_single_agent
+
+        _mcp_stack = AsyncExitStack()
+        await _mcp_stack.__aenter__()
+        tools, per_server = await open_mcp_tools(_mcp_stack)
+        # Build the agent ONCE and keep a handle on it: the /chat streaming path
+        # streams this agent directly (token-by-token), and the graph wraps the
+        # SAME agent for the non-streaming path.
+        agent, _tool_names = build_single_agent(tools)
+        ctx.single_agent = agent
+        ctx.graph_app = build_graph(
+            neo4j_graph=ctx.neo4j_graph,
+            fiware_client=ctx.fiware_client,
+            ors_client=ctx.ors_client,
+            semantic_cache=ctx.semantic_cache,
+            checkpointer=ctx.checkpointer,
+            tools=tools,
+            agent=agent,
+        )
+        logger.info(f"[MCP] single gpt-5.4 agent ready on {len(tools)} MCP tools: {per_server}")
+        try:
+            await stop_warmup
+        except Exception as e:
+            logger.warning(f"[nearest_stop] warmup failed: {e}")
+    finally:
+        # Startup failed before the warm-up was awaited: don't leave the
+        # task dangling.
+        if not stop_warmup.done():
+            stop_warmup.cancel()
 
     try:
         yield
@@ -326,6 +474,7 @@ app = FastAPI(
     description="AI Assistant for OVGU Campus and Magdeburg City - single gpt-5.4 LangGraph agent (optional MCP tool servers)",
     version="6.0.0",
     lifespan=lifespan,
+    default_response_class=_JSONResponse,
 )
 
 app.add_middleware(
@@ -358,47 +507,104 @@ class ChatRequest(BaseModel):
     language: Optional[str] = Field("en", pattern=r"^(en|de)$")
     user_location: Optional[UserLocation] = None
     stream: bool = False
+    # Clients that don't render a map (e.g. voice-only) set this to false to
+    # skip card extraction and the card SSE events entirely.
+    wants_map: bool = True
 
 
 # ---------------------------------------------------------------------------
 # Location helpers
 # ---------------------------------------------------------------------------
+_ROUTE_KEYWORDS = (
+    "how do i get to", "how to get to", "how can i get to",
+    "how can i go to", "how do i go to",
+    "directions to", "route to", "way to",
+    "how far is", "distance to",
+    "take me to", "navigate to",
+    "get to", "go to"
+)
+
+_ORIGIN_KEYWORDS = (
+    "from", "starting from", "starting at",
+    "i'm at", "im at", "i am at",
+    "currently at", "at the"
+)
+
+# One precompiled alternation per keyword set: a single pass over the message
+# instead of a separate substring scan per keyword. Case-insensitive matching
+# on the raw message skips the lower() copy, and the origin set is only
+# scanned after a route keyword hit, so a non-route message costs one pass.
+_ROUTE_RE = re.compile("|".join(map(re.escape, _ROUTE_KEYWORDS)), re.IGNORECASE)
+_ORIGIN_RE = re.compile("|".join(map(re.escape, _ORIGIN_KEYWORDS)), re.IGNORECASE)
+
+
 def is_route_question_without_origin(message: str) -> bool:
-    message_lower = message.lower()
+    if _ROUTE_RE.search(message) is None:
+        return False
+    return _ORIGIN_RE.search(message) is None
 
-    route_keywords = [
-        "how do i get to", "how to get to", "how can i get to",
-        "how can i go to", "how do i go to",
-        "directions to", "route to", "way to",
-        "how far is", "distance to",
-        "take me to", "navigate to",
-        "get to", "go to"
-    ]
 
-    origin_keywords = [
-        "from", "starting from", "starting at",
-        "i'm at", "im at", "i am at",
-        "currently at", "at the"
-    ]
+# ---------------------------------------------------------------------------
+# Trivial messages
+# ---------------------------------------------------------------------------
+# A bare greeting, thanks or goodbye gets a canned reply without running the
+# graph (no LLM, Neo4j or FIWARE call). Matched on the whole normalised
+# message, so anything with actual content still goes to the agent. The
+# reply language follows the request's `language`, not the greeting word.
+_TRIVIAL_KINDS = {
+    **dict.fromkeys(("hi", "hello", "hey", "good morning", "good evening",
+                     "hallo", "moin", "servus", "guten tag", "guten morgen"), "greeting"),
+    **dict.fromkeys(("thanks", "thank you", "thx", "thanks a lot",
+                     "danke", "danke schön", "danke schoen", "vielen dank"), "thanks"),
+    **dict.fromkeys(("bye", "goodbye", "see you", "tschüss", "tschuess", "ciao"), "bye"),
+}
+_TRIVIAL_REPLIES = {
+    "en": {
+        "greeting": ("Hi! I'm the Magdeburg campus assistant. Ask me about buildings, "
+                     "routes, public transport, parking, weather or traffic."),
+        "thanks": "You're welcome! Anything else I can help with?",
+        "bye": "Goodbye! Have a good day in Magdeburg.",
+    },
+    "de": {
+        "greeting": ("Hallo! Ich bin der Magdeburger Campus-Assistent. Frag mich nach "
+                     "Gebäuden, Routen, ÖPNV, Parken, Wetter oder Verkehr."),
+        "thanks": "Gern geschehen! Kann ich sonst noch helfen?",
+        "bye": "Tschüss! Einen schönen Tag in Magdeburg.",
+    },
+}
+_TRIVIAL_PUNCT = " \t\r\n!.?,"
+
+
+def _trivial_reply(message: str, language: Optional[str] = "en") -> Optional[str]:
+    """Canned reply for a bare greeting / thanks / goodbye in `language`
+    ("en" or "de"), else None."""
+    if len(message) > 24:
+        return None
+    kind = _TRIVIAL_KINDS.get(message.strip(_TRIVIAL_PUNCT).lower())
+    if kind is None:
+        return None
+    return _TRIVIAL_REPLIES.get(language, _TRIVIAL_REPLIES["en"])[kind]
 
-    has_route_keyword = any(kw in message_lower for kw in route_keywords)
-    has_origin = any(kw in message_lower for kw in origin_keywords)
 
-    return has_route_keyword and not has_origin
+async def _stream_trivial(reply: str, session_id: str):
+    yield _sse({'type':'token','content':reply})
+    yield _sse({'type':'done','session_id':session_id})
 
 
 # ---------------------------------------------------------------------------
 # Endpoints
 # ---------------------------------------------------------------------------
 @app.get("/", response_class=HTMLResponse, tags=["meta"])
-async def root():
-    index_path = os.path.join(_templates_dir, "index.html")
-    if os.path.isfile(index_path):
+async def root(request: Request):
+    if _INDEX_HTML is not None:
         # no-cache so the browser always revalidates the HTML and therefore
         # picks up new ?v= asset versions immediately (the static JS/CSS stay
-        # cache-busted by their version query string).
-        return FileResponse(index_path, media_type="text/html",
-                            headers={"Cache-Control": "no-cache"})
+        # cache-busted by their version query string). The ETag makes that
+        # revalidation a bodiless 304.
+        headers = {"Cache-Control": "no-cache", "ETag": _INDEX_ETAG}
+        if request.headers.get("if-none-match") == _INDEX_ETAG:
+            return Response(status_code=304, headers=headers)
+        return HTMLResponse(_INDEX_HTML, headers=headers)
     return HTMLResponse("<h1>Magdeburg Assistant API</h1><p>No chat UI installed.</p>")
 
 @app.get("/status", tags=["meta"])
@@ -409,9 +615,20 @@ async def status():
         "features": ["langgraph", "single_agent", "mcp_optional"]
     }
 
+# Liveness probes hit /health every few seconds; reuse the last Neo4j ping
+# for a short window instead of paying a round trip per probe.
+HEALTH_CACHE_SECONDS = 5.0
+_last_health_check = (float("-inf"), False)
+
+
 @app.get("/health", tags=["meta"])
 async def health():
-    neo4j_ok = await asyncio.to_thread(ctx.neo4j_graph.test_connection)
+    global _last_health_check
+    now = time.monotonic()
+    checked_at, neo4j_ok = _last_health_check
+    if now - checked_at >= HEALTH_CACHE_SECONDS:
+        neo4j_ok = await asyncio.to_thread(ctx.neo4j_graph.test_connection)
+        _last_health_check = (now, neo4j_ok)
     return {
         "status": "healthy" if neo4j_ok else "degraded",
         "neo4j": "connected" if neo4j_ok else "disconnected",
@@ -446,33 +663,38 @@ def _coerce_output_str(output):
     return str(content)
 
 
+def _card_transit_segment(seg):
+    get = seg.get
+    return {
+        "line": get("line"),
+        "direction": get("direction"),
+        "from": get("from"),
+        "to": get("to"),
+        "num_stops": get("num_stops"),
+        "stops": get("stops") or [],
+    }
+
+
 def _card_transit_route(data):
     if not isinstance(data, dict) or "segments" not in data:
         return None
-    origin = data.get("origin") or {}
-    dest = data.get("destination") or {}
+    # Bound .get methods: each dict is probed several times below, and the
+    # segment list is per-leg, so skip the attribute lookup on every probe.
+    get = data.get
+    oget = (get("origin") or {}).get
+    dget = (get("destination") or {}).get
     return {
         "type": "transit_route",
-        "origin": origin.get("search_term") or origin.get("stop"),
-        "origin_stop": origin.get("stop"),
-        "origin_walk_m": int(origin.get("walk_meters") or 0),
-        "destination": dest.get("search_term") or dest.get("stop"),
-        "destination_stop": dest.get("stop"),
-        "destination_walk_m": int(dest.get("walk_meters") or 0),
-        "total_stops": data.get("total_stops"),
-        "total_transfers": data.get("total_transfers") or 0,
-        "transfer_points": data.get("transfer_points") or [],
-        "segments": [
-            {
-                "line": s.get("line"),
-                "direction": s.get("direction"),
-                "from": s.get("from"),
-                "to": s.get("to"),
-                "num_stops": s.get("num_stops"),
-                "stops": s.get("stops") or [],
-            }
-            for s in (data.get("segments") or [])
-        ],
+        "origin": oget("search_term") or oget("stop"),
+        "origin_stop": oget("stop"),
+        "origin_walk_m": int(oget("walk_meters") or 0),
+        "destination": dget("search_term") or dget("stop"),
+        "destination_stop": dget("stop"),
+        "destination_walk_m": int(dget("walk_meters") or 0),
+        "total_stops": get("total_stops"),
+        "total_transfers": get("total_transfers") or 0,
+        "transfer_points": get("transfer_points") or [],
+        "segments": [_card_transit_segment(s) for s in (get("segments") or [])],
     }
 
 
@@ -619,59 +841,71 @@ def _card_places_generic(data, cap=12):
     return cards
 
 
+def _one_card(card):
+    return [card] if card else []
+
+
+# Tool name -> card builder. A tool result yields cards from at most one
+# builder, so dispatch is a table lookup rather than an if-chain. Keys are
+# the MCP tool names; _card_builder_for also matches them as substrings so
+# server-prefixed names ("routing_get_walking_route") still resolve. Order
+# matters for that fallback: compound planners before the single-mode tools.
+_CARD_BUILDERS = {
+    "find_transit_route": lambda d: _one_card(_card_transit_route(d)),
+    "get_routes_for_places": lambda d: _route_cards_from_modes(d) if isinstance(d, dict) else [],
+    "get_all_routes": lambda d: _route_cards_from_modes(d) if isinstance(d, dict) else [],
+    "walking_route": lambda d: _one_card(_card_route(d, "walking")),
+    "cycling_route": lambda d: _one_card(_card_route(d, "cycling")),
+    "driving_route": lambda d: _one_card(_card_route(d, "driving")),
+    # Place lookups → map pin at the resolved coordinates.
+    "get_building": lambda d: _one_card(_card_place(d, kind="building")),
+    "resolve_place_to_coordinates": lambda d: _one_card(_card_place(d, kind="place")),
+    # Open-ended results → pin EVERY place that carries coordinates (POIs,
+    # buildings, landmarks via Cypher; the context bridge's resolved location).
+    # Generic, so any place the agent surfaces shows on the map.
+    "execute_cypher": _card_places_generic,
+    "get_nearby_context": _card_places_generic,
+}
+
+
+@functools.lru_cache(maxsize=128)
+def _card_builder_for(name):
+    builder = _CARD_BUILDERS.get(name)
+    if builder is not None:
+        return builder
+    for key, fn in _CARD_BUILDERS.items():
+        if key in name:
+            return fn
+    return None
+
+
 def _extract_cards_from_tool(tool_name, raw_output):
+    # Resolve the builder first: tools that never produce cards (weather,
+    # schema, sensors...) skip the JSON decode entirely.
+    builder = _card_builder_for((tool_name or "").lower())
+    if builder is None:
+        return []
     content = _coerce_output_str(raw_output)
     if not content:
         return []
     try:
-        data = json.loads(content)
+        data = _loads(content)
     except (json.JSONDecodeError, TypeError, ValueError):
         logger.debug(f"[CARD] tool {tool_name} returned non-JSON content; skipping")
         return []
     if isinstance(data, dict) and data.get("error"):
         return []
-
-    name = (tool_name or "").lower()
-
-    if "find_transit_route" in name:
-        c = _card_transit_route(data)
-        return [c] if c else []
-    # Compound planners first (their names also contain "routes"); each carries
-    # a {routes: {walking, cycling, driving}} block with decoded geometry.
-    if "get_routes_for_places" in name and isinstance(data, dict):
-        return _route_cards_from_modes(data)
-    if "get_all_routes" in name and isinstance(data, dict):
-        return _route_cards_from_modes(data)
-    if "walking_route" in name:
-        c = _card_route(data, "walking")
-        return [c] if c else []
-    if "cycling_route" in name:
-        c = _card_route(data, "cycling")
-        return [c] if c else []
-    if "driving_route" in name:
-        c = _card_route(data, "driving")
-        return [c] if c else []
-    # Place lookups → map pin at the resolved coordinates.
-    if "get_building" in name:
-        c = _card_place(data, kind="building")
-        return [c] if c else []
-    if "resolve_place_to_coordinates" in name:
-        c = _card_place(data, kind="place")
-        return [c] if c else []
-    # Open-ended results → pin EVERY place that carries coordinates (POIs,
-    # buildings, landmarks via Cypher; the context bridge's resolved location).
-    # Generic, so any place the agent surfaces shows on the map.
-    if "execute_cypher" in name or "get_nearby_context" in name:
-        return _card_places_generic(data)
-    return []
+    return builder(data)
 
 
-def _extract_cards_from_messages(messages):
+def _extract_cards_from_messages(messages, skip_ids=frozenset()):
     """Build UI cards from the single agent's tool-call results.
 
     Walks the ReAct message list the agent returns in state["messages"]:
     first maps each tool_call_id -> tool name from the AIMessages, then
     feeds every ToolMessage's (name, content) to _extract_cards_from_tool.
+    ToolMessages whose tool_call_id is in `skip_ids` were already turned
+    into cards while streaming and are not decoded again.
 
     This is the MCP single-agent replacement for the old
     _extract_cards_from_agent_output, which read the now-unused
@@ -694,7 +928,10 @@ def _extract_cards_from_messages(messages):
     for m in messages:
         if type(m).__name__ != "ToolMessage":
             continue
-        name = id_to_name.get(getattr(m, "tool_call_id", None)) or getattr(m, "name", None)
+        tc_id = getattr(m, "tool_call_id", None)
+        if tc_id is not None and tc_id in skip_ids:
+            continue
+        name = id_to_name.get(tc_id) or getattr(m, "name", None)
         try:
             cards.extend(_extract_cards_from_tool(name, getattr(m, "content", None)))
         except Exception as e:
@@ -708,7 +945,7 @@ def _card_dedup_key(card):
         return f"tr:{card.get('origin_stop')}->{card.get('destination_stop')}"
     if t == "route":
         return f"rt:{card.get('mode')}:{card.get('distance_m')}:{card.get('duration_s')}"
-    return json.dumps(card, sort_keys=True)
+    return _dumpb_sorted(card)
 
 
 def _build_graph_input(message: str, session_id: str, user_location, conversation_history):
@@ -728,6 +965,8 @@ class _ThinkStripper:
     Buffers the tail so tokens split mid-tag are not leaked.
     Tracks nesting depth so nested <think> tags are handled."""
 
+    __slots__ = ("_buf", "_depth")
+
     _SAFE_TAIL = 8  # longer than len("</think>")
 
     def __init__(self):
@@ -736,6 +975,11 @@ class _ThinkStripper:
 
     def feed(self, token: str) -> str:
         self._buf += token
+        # Fast path: outside a think span, a buffer with no '<' cannot hold
+        # even the start of a tag, so it is all safe to emit.
+        if self._depth == 0 and "<" not in self._buf:
+            text, self._buf = self._buf, ""
+            return text
         out = []
         while True:
             if self._depth > 0:
@@ -772,15 +1016,20 @@ class _ThinkStripper:
         return tail
 
 
+@functools.lru_cache(maxsize=1)
+def _proactive_node():
+    """The proactive bridge node, built once and shared by every turn (its
+    only binding, the FIWARE client, is process-wide)."""
+    return create_proactive_node(ctx.fiware_client)
+
+
 async def _compute_proactive_context(user_location) -> str:
     """Best-effort nearby live context (weather/parking/traffic) for the
     streaming path — mirrors the graph's proactive bridge node."""
     if not user_location:
         return ""
     try:
-        from graph.nodes.proactive_node import create_proactive_node
-        node = create_proactive_node(ctx.fiware_client)
-        res = await node({"user_location": user_location})
+        res = await _proactive_node()({"user_location": user_location})
         return (res or {}).get("proactive_context", "") or ""
     except Exception:
         return ""
@@ -789,7 +1038,6 @@ async def _compute_proactive_context(user_location) -> str:
 async def _compose_user_message(query, user_location, conversation_history) -> str:
     """Assemble the agent's user message exactly like the single_agent graph
     node does (recent history + location + proactive context + question)."""
-    from graph.agent import _format_history, _format_location
     parts = []
     history_text = _format_history(conversation_history or [])
     if history_text:
@@ -805,25 +1053,30 @@ async def _compose_user_message(query, user_location, conversation_history) -> s
 
 
 async def _stream_chat(message: str, orig_message: str, session_id: str,
-                       user_location, conversation_history):
+                       user_location, conversation_history, wants_map: bool = True):
     """Stream the agent's answer token-by-token (ChatGPT/Claude-style).
 
     Streams the gpt-5.4 ReAct agent DIRECTLY with stream_mode=["values",
     "messages"] so the final-answer tokens surface as the model writes them
     (the outer graph couldn't propagate them because the agent ran inside an
     opaque ainvoke node). The thinking model's <think>…</think> spans are
-    stripped so only the answer shows; the final tool transcript still yields
-    the map cards.
+    stripped so only the answer shows. Map cards are built as each tool result
+    arrives (while the model is still writing) and the final tool transcript
+    is re-scanned as a catch-all.
 
     A background producer feeds tokens onto a queue while the consumer emits
     SSE heartbeats during the (tool-calling) gap before the first token. Falls
     back to the one-shot graph path if the agent handle is unavailable. Note:
     the streaming path skips the semantic cache (disabled in prod anyway).
     """
+    # StreamingResponse may iterate this generator outside the endpoint's
+    # context, so bind the session for this request's log lines here too.
+    _current_session_id.set(session_id)
     agent = getattr(ctx, "single_agent", None)
     if agent is None:
         async for ev in _stream_chat_oneshot(
-            message, orig_message, session_id, user_location, conversation_history
+            message, orig_message, session_id, user_location, conversation_history,
+            wants_map=wants_map,
         ):
             yield ev
         return
@@ -831,6 +1084,8 @@ async def _stream_chat(message: str, orig_message: str, session_id: str,
     user_msg = await _compose_user_message(message, user_location, conversation_history)
     inputs = {"messages": [HumanMessage(content=user_msg)]}
     queue: asyncio.Queue = asyncio.Queue()
+    # tool_call_ids whose cards the producer already built while streaming.
+    carded_tool_ids: set = set()
 
     async def _producer():
         stripper = _ThinkStripper()
@@ -845,6 +1100,27 @@ async def _stream_chat(message: str, orig_message: str, session_id: str,
                             visible = stripper.feed(piece)
                             if visible:
                                 await queue.put(("token", visible))
+                    elif wants_map and type(chunk).__name__ == "ToolMessage":
+                        # Build the map cards as soon as a tool result lands,
+                        # overlapping the card work with the model's final
+                        # answer instead of running it after the last token.
+                        # JSON decode + polyline decode of a route payload is
+                        # CPU work, so it runs off the event loop.
+                        try:
+                            cards = await asyncio.to_thread(
+                                _extract_cards_from_tool,
+                                getattr(chunk, "name", None), getattr(chunk, "content", None),
+                            )
+                            for card in cards:
+                                await queue.put(("card", card))
+                            # Only skip this result in the final pass if it
+                            # actually produced cards here; a missing tool
+                            # name is resolved there via the AI tool_calls.
+                            tc_id = getattr(chunk, "tool_call_id", None)
+                            if cards and tc_id:
+                                carded_tool_ids.add(tc_id)
+                        except Exception as card_err:
+                            logger.debug(f"[CARD] early extraction failed: {card_err}")
                 elif mode == "values":
                     if isinstance(data, dict) and data.get("messages"):
                         final_msgs = data["messages"]
@@ -866,6 +1142,7 @@ async def _stream_chat(message: str, orig_message: str, session_id: str,
     acc: list = []
     final_msgs = None
     errored = False
+    emitted_card_keys = set()
 
     try:
         while True:
@@ -875,24 +1152,28 @@ async def _stream_chat(message: str, orig_message: str, session_id: str,
                 if time.monotonic() - start > AGENT_TIMEOUT:
                     logger.warning(f"[STREAM] agent exceeded {AGENT_TIMEOUT}s (session={session_id})")
                     if not acc:
-                        msg = "Sorry, that took longer than expected to look up. Please try again."
-                        acc.append(msg)
-                        yield f"data: {json.dumps({'type':'token','content':msg})}\n\n"
+                        acc.append(TIMEOUT_REPLY)
+                        yield _SSE_TIMEOUT_REPLY
                     break
-                yield f"event: heartbeat\ndata: {json.dumps({'ts': int(time.time())})}\n\n"
+                yield _sse_heartbeat()
                 continue
 
             if kind == "__end__":
                 break
             if kind == "token":
                 acc.append(payload)
-                yield f"data: {json.dumps({'type':'token','content':payload})}\n\n"
+                yield _sse({'type':'token','content':payload})
+            elif kind == "card":
+                key = _card_dedup_key(payload)
+                if key not in emitted_card_keys:
+                    emitted_card_keys.add(key)
+                    yield _sse({'type':'card','card':payload})
             elif kind == "final":
                 final_msgs = payload
             elif kind == "error":
                 errored = True
                 if not acc:
-                    yield f"data: {json.dumps({'type':'error','content':'stream error'})}\n\n"
+                    yield _SSE_STREAM_ERROR
 
         full_text = "".join(acc).strip()
 
@@ -904,25 +1185,28 @@ async def _stream_chat(message: str, orig_message: str, session_id: str,
                     c = _coerce_output_str(m)
                     if c and c.strip():
                         full_text = c.strip()
-                        yield f"data: {json.dumps({'type':'token','content':full_text})}\n\n"
+                        yield _sse({'type':'token','content':full_text})
                         break
 
-        # Map cards from the final tool transcript.
-        if final_msgs:
+        # Map cards from the final tool transcript — catches anything the
+        # early per-tool extraction missed. Tool results already carded while
+        # streaming are skipped rather than decoded a second time.
+        if wants_map and final_msgs:
             try:
-                cards = _extract_cards_from_messages(final_msgs)
+                cards = await asyncio.to_thread(
+                    _extract_cards_from_messages, final_msgs, frozenset(carded_tool_ids),
+                )
             except Exception as card_err:
                 logger.debug(f"[CARD] extraction from tool messages failed: {card_err}")
                 cards = []
-            emitted_card_keys = set()
             for card in cards:
                 key = _card_dedup_key(card)
                 if key in emitted_card_keys:
                     continue
                 emitted_card_keys.add(key)
-                yield f"data: {json.dumps({'type':'card','card':card})}\n\n"
+                yield _sse({'type':'card','card':card})
 
-        yield f"data: {json.dumps({'type':'done','session_id':session_id})}\n\n"
+        yield _sse({'type':'done','session_id':session_id})
 
         if full_text and not errored:
             _add_to_history(session_id, orig_message, full_text)
@@ -933,7 +1217,7 @@ async def _stream_chat(message: str, orig_message: str, session_id: str,
 
 
 async def _stream_chat_oneshot(message: str, orig_message: str, session_id: str,
-                       user_location, conversation_history):
+                       user_location, conversation_history, wants_map: bool = True):
     """One-shot fallback: run the full graph via ainvoke and send the answer in
     a single chunk. Used only when the streaming agent handle is unavailable.
 
@@ -963,8 +1247,7 @@ async def _stream_chat_oneshot(message: str, orig_message: str, session_id: str,
     # This sidesteps a 60s fiware_agent hang observed on repeat queries
     # within the same session (confirmed by the 2026-04-23 parking query
     # log — first query 18s, second query 63s in the same thread_id).
-    import uuid as _uuid
-    config = {"configurable": {"thread_id": f"{session_id}:{_uuid.uuid4().hex[:8]}"}}
+    config = {"configurable": {"thread_id": f"{session_id}:{uuid.uuid4().hex[:8]}"}}
 
     KEEPALIVE_INTERVAL = 2.5
     heartbeat_count = 0
@@ -989,24 +1272,30 @@ async def _stream_chat_oneshot(message: str, orig_message: str, session_id: str,
                     f"[STREAM-DIAG] heartbeat #{heartbeat_count} "
                     f"(graph running, session={session_id})"
                 )
-                yield f"event: heartbeat\ndata: {json.dumps({'ts': int(time.time())})}\n\n"
+                yield _sse_heartbeat()
 
         # Graph finished — materialise its result.
         result = graph_task.result()
+        # Type-check and key listing done once; both diagnostics reuse them.
+        result_is_dict = isinstance(result, dict)
+        result_keys = list(result) if result_is_dict else None
         logger.info(
             f"[STREAM-DIAG] ainvoke complete after {heartbeat_count} heartbeats, "
-            f"keys={list(result.keys()) if isinstance(result, dict) else type(result).__name__}"
+            f"keys={result_keys if result_is_dict else type(result).__name__}"
         )
 
         response_text = None
-        if isinstance(result, dict):
+        if result_is_dict:
             response_text = result.get("final_response") or result.get("response")
 
             # Cards come from the agent's tool results (find_transit_route +
             # routing tools). Walk the ReAct transcript the single agent
             # returns in `messages` and build cards from those tool outputs.
             try:
-                cards = _extract_cards_from_messages(result.get("messages"))
+                cards = (
+                    await asyncio.to_thread(_extract_cards_from_messages, result.get("messages"))
+                    if wants_map else []
+                )
             except Exception as card_err:
                 logger.debug(f"[CARD] extraction from tool messages failed: {card_err}")
                 cards = []
@@ -1016,24 +1305,24 @@ async def _stream_chat_oneshot(message: str, orig_message: str, session_id: str,
                 if key in emitted_card_keys:
                     continue
                 emitted_card_keys.add(key)
-                yield f"data: {json.dumps({'type':'card','card':card})}\n\n"
+                yield _sse({'type':'card','card':card})
 
         if response_text:
-            yield f"data: {json.dumps({'type':'token','content':response_text})}\n\n"
+            yield _sse({'type':'token','content':response_text})
             _add_to_history(session_id, orig_message, response_text)
         else:
             logger.warning(
                 f"[STREAM-DIAG] graph produced no response. "
-                f"keys={list(result.keys()) if isinstance(result, dict) else 'n/a'}"
+                f"keys={result_keys if result_is_dict else 'n/a'}"
             )
 
         done_payload = {"type": "done", "session_id": session_id}
-        yield f"data: {json.dumps(done_payload)}\n\n"
+        yield _sse(done_payload)
 
     except Exception as e:
         logger.exception("stream chat failed")
-        yield f"data: {json.dumps({'type':'error','content':'stream error'})}\n\n"
-        yield f"data: {json.dumps({'type':'done','session_id':session_id})}\n\n"
+        yield _SSE_STREAM_ERROR
+        yield _sse({'type':'done','session_id':session_id})
     except BaseException as be:
         # Client disconnect / cancellation. Kill the graph task so the
         # MCP subprocesses and Neo4j sessions aren't kept busy after the
@@ -1098,8 +1387,25 @@ async def chat_endpoint(
         if not x_session_token or not secrets.compare_digest(expected, x_session_token):
             raise HTTPException(status_code=401, detail="invalid or missing session token")
     else:
-        import uuid
         session_id = str(uuid.uuid4())
+    _current_session_id.set(session_id)
+
+    # H29: redact PII from any user-originated text before logging.
+    safe_user_input = _redact_pii(request.message)
+    logger.info(f"User: {safe_user_input} | Session: {session_id} (stream={request.stream})")
+
+    conversation_history = _begin_turn(session_id)
+
+    # A bare greeting / thanks / goodbye is answered before any I/O: no
+    # nearest-stop lookup, route detection or graph run.
+    trivial = _trivial_reply(request.message, request.language)
+    if trivial is not None:
+        logger.info("[TRIVIAL] canned reply, graph skipped")
+        background_tasks.add_task(_add_to_history, session_id, request.message, trivial)
+        if request.stream:
+            return StreamingResponse(_stream_trivial(trivial, session_id),
+                                     media_type="text/event-stream", headers=_SSE_HEADERS)
+        return _JSONResponse({"text": trivial, "session_id": session_id, "type": "answer"})
 
     # L24: fire the nearest-stop lookup in a background thread **in parallel**
     # with the rest of the pipeline so it never adds to the critical path.
@@ -1140,69 +1446,55 @@ async def chat_endpoint(
                 pass
         nearest_stop_task.add_done_callback(_swallow)
 
-    # H29: redact PII from any user-originated text before logging.
-    safe_user_input = _redact_pii(request.message)
-    logger.info(f"User: {safe_user_input} | Session: {session_id} (stream={request.stream})")
-
-    _touch_session(session_id)
-    conversation_history = _get_conversation_history(session_id)
-
     if request.stream:
         return StreamingResponse(
-            _stream_chat(message, request.message, session_id, user_location, conversation_history),
+            _stream_chat(message, request.message, session_id, user_location, conversation_history,
+                         wants_map=request.wants_map),
             media_type="text/event-stream",
-            # Content-Encoding: identity opts this stream OUT of GZipMiddleware,
-            # which otherwise buffers the whole SSE response in its gzip
-            # compressor and only flushes at the end (Starlette's GZipResponder
-            # never flushes per chunk) — that defeats token streaming entirely.
-            # X-Accel-Buffering disables proxy buffering (nginx/traefik).
-            headers={
-                "Cache-Control": "no-cache",
-                "X-Accel-Buffering": "no",
-                "Content-Encoding": "identity",
-            },
+            headers=_SSE_HEADERS,
         )
 
+    # Only the graph call can fail here; everything after it is plain dict
+    # and list work, so it stays outside the handler.
     try:
-        try:
-            # See _stream_chat for rationale on per-invocation thread_id.
-            import uuid as _uuid
-            result = await asyncio.wait_for(
-                ctx.graph_app.ainvoke(
-                    _build_graph_input(message, session_id, user_location, conversation_history),
-                    config={"configurable": {"thread_id": f"{session_id}:{_uuid.uuid4().hex[:8]}"}},
-                ),
-                timeout=30.0,
-            )
-        except asyncio.TimeoutError:
-            logger.warning(f"/chat request exceeded 30s deadline (session={session_id})")
-            raise HTTPException(status_code=504, detail="Request exceeded 30s deadline")
-
-        response_text = result.get("response", "I'm sorry, I couldn't process your request.")
-
-        # L23: fast return. History persistence, PII redaction on the reply,
-        # and any future cache_store writes happen after the HTTP response
-        # has been flushed — the user sees the answer sooner.
-        background_tasks.add_task(
-            _add_to_history, session_id, request.message, response_text
+        # See _stream_chat for rationale on per-invocation thread_id.
+        result = await asyncio.wait_for(
+            ctx.graph_app.ainvoke(
+                _build_graph_input(message, session_id, user_location, conversation_history),
+                config={"configurable": {"thread_id": f"{session_id}:{uuid.uuid4().hex[:8]}"}},
+            ),
+            timeout=30.0,
         )
-
-        return {
-            "text": response_text,
-            "session_id": session_id,
-            "type": "answer",
-        }
-
-    except HTTPException:
-        raise
+    except asyncio.TimeoutError:
+        logger.warning(f"/chat request exceeded 30s deadline (session={session_id})")
+        raise HTTPException(status_code=504, detail="Request exceeded 30s deadline")
     except Exception as e:
         logger.exception(f"chat endpoint failed: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
+    fallback_text = "I'm sorry, I couldn't process your request."
+    response_text = (
+        result.get("response", fallback_text) if isinstance(result, dict) else fallback_text
+    )
+
+    # L23: fast return. History persistence, PII redaction on the reply,
+    # and any future cache_store writes happen after the HTTP response
+    # has been flushed — the user sees the answer sooner.
+    background_tasks.add_task(
+        _add_to_history, session_id, request.message, response_text
+    )
+
+    # Returned as a response object so FastAPI skips its jsonable_encoder
+    # walk over the envelope; orjson encodes the plain dict directly.
+    return _JSONResponse({
+        "text": response_text,
+        "session_id": session_id,
+        "type": "answer",
+    })
+
 
 @app.post("/session/start", tags=["session"])
 async def session_start():
-    import uuid
     session_id = str(uuid.uuid4())
     session_token = secrets.token_urlsafe(32)
     with _session_active_lock:
@@ -1215,9 +1507,7 @@ async def session_start():
 @app.post("/session/{session_id}/end", tags=["session"])
 async def session_end(session_id: str = Depends(verify_session_token)):
     with _session_active_lock:
-        _session_last_active.pop(session_id, None)
-        _session_histories.pop(session_id, None)
-        _session_tokens.pop(session_id, None)
+        _drop_session_locked(session_id)
     logger.info(f"Session '{session_id}' destroyed")
     return {"status": "ok", "session_id": session_id}
 
@@ -1244,4 +1534,6 @@ if __name__ == "__main__":
     # reload=False so WatchFiles does not restart the server mid-request.
     # Restarts kill the 4 MCP stdio subprocesses and wipe in-memory session
     # state, which manifested as agent timeouts and 404s on /session/end.
-    uvicorn.run("api:app", host="127.0.0.1", port=8000, reload=False)
+    # Same loop as the Dockerfile CMD: uvloop when installed, else asyncio.
+    uvicorn.run("api:app", host="127.0.0.1", port=8000, reload=False,
+                loop="uvloop" if _HAS_UVLOOP else "asyncio")
@@ -11,6 +11,7 @@ The FIWARE `coords` parameter is formatted `lat,lon` (as produced here from
 """
 
 import asyncio
+import logging
 import random
 import threading
 import time
@@ -18,6 +19,8 @@ from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 import httpx
 
+logger = logging.getLogger(__name__)
+
 try:  # services/thresholds.py is owned by a sibling agent — import defensively.
     from services.thresholds import CACHE_TTL_SECONDS as _DEFAULT_CACHE_TTL
 except Exception:  # pragma: no cover - thresholds is optional at import time
@@ -35,6 +38,19 @@ try:
 except Exception:  # pragma: no cover
     _HAS_TENACITY = False
 
+# orjson parses large bodies several times faster than httpx's stdlib-based
+# `response.json()`; its decode error subclasses ValueError. Falls back to json.
+try:
+    import orjson
+
+    def _loads(content: bytes) -> Any:
+        return orjson.loads(content)
+except ImportError:  # pragma: no cover
+    import json
+
+    def _loads(content: bytes) -> Any:
+        return json.loads(content)
+
 
 _SHARED_TIMEOUT = httpx.Timeout(connect=5.0, read=10.0, write=10.0, pool=5.0)
 _SHARED_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=50)
@@ -125,6 +141,8 @@ def _assert_magdeburg_bounds(lat: float, lon: float) -> None:
 class _TTLCache:
     """Tiny thread-safe TTL cache keyed by (endpoint, sorted-args tuple)."""
 
+    __slots__ = ("ttl", "_store", "_lock")
+
     def __init__(self, ttl_seconds: float = _RESPONSE_TTL_SECONDS) -> None:
         self.ttl = ttl_seconds
         self._store: Dict[Tuple, Tuple[float, Any]] = {}
@@ -164,7 +182,7 @@ def _safe_json(
     endpoint: str,
     expected: str,
 ) -> Tuple[Optional[Any], Optional[Dict[str, Any]]]:
-    """Decode `response.json()` defensively.
+    """Decode the response body defensively.
 
     Returns `(body, None)` on success, or `(None, error_dict)` on schema drift.
     `expected` is the type the caller is prepared to receive: one of
@@ -172,7 +190,7 @@ def _safe_json(
     specific top-level keys on top of this.
     """
     try:
-        body = response.json()
+        body = _loads(response.content)
     except (ValueError, TypeError) as exc:
         return None, {
             "found": False,
@@ -331,6 +349,10 @@ class FIWAREClient:
         self.base_url = base_url.rstrip('/')
         self.api_key = api_key
         self._headers = {**_DEFAULT_HEADERS, "x-api-key": api_key}
+        # Fixed endpoint URLs, built once instead of per request.
+        self._entities_url = f"{self.base_url}/entities"
+        self._types_url = f"{self.base_url}/types"
+        self._types_headers = {**self._headers, "Accept": "application/json"}
 
     # ---- clients (module-level singletons) ------------------------------
     @classmethod
@@ -464,7 +486,7 @@ class FIWAREClient:
             entity_type, entity_id, id_pattern, q, mq, georel, geometry,
             coords, attrs, metadata, order_by, limit, offset, options,
         )
-        url = f"{self.base_url}/entities"
+        url = self._entities_url
         key = _cache_key(url, params)
         cached = _fiware_cache.get(key)
         if cached is not None:
@@ -530,15 +552,13 @@ class FIWAREClient:
         attrs: Optional[str] = None,
     ) -> Dict[str, Any]:
         _assert_magdeburg_bounds(latitude, longitude)
-        print(f"[FIWARE] Geo-query: type={sensor_type}, coords=({latitude}, {longitude}), radius={radius}m")
+        # Debug lines on this per-sensor path use lazy %-args so nothing is
+        # formatted unless DEBUG is enabled.
+        logger.debug("[FIWARE] Geo-query: type=%s, coords=(%s, %s), radius=%sm",
+                     sensor_type, latitude, longitude, radius)
 
-        type_mapping = {
-            "Weather": "Weather", "Parking": "Parking", "Traffic": "Traffic",
-            "AirQuality": "AirQuality", "Room": "Room", "Vehicle": "Vehicle", "POI": "POI",
-        }
-        fiware_type = type_mapping.get(sensor_type, sensor_type)
         params: Dict[str, str] = {
-            "type": fiware_type,
+            "type": sensor_type,
             "georel": f"near;maxDistance:{radius}",
             "geometry": "point",
             "coords": f"{latitude},{longitude}",
@@ -547,7 +567,7 @@ class FIWAREClient:
         }
         if attrs:
             params["attrs"] = attrs
-        url = f"{self.base_url}/entities"
+        url = self._entities_url
         client = self._async_client()
         try:
             response = await _aretry_call(
@@ -570,16 +590,16 @@ class FIWAREClient:
         if err is not None:
             return err
         if not entities:
-            print(f"[FIWARE] No sensor found within {radius}m")
+            logger.debug("[FIWARE] No sensor found within %sm", radius)
             return {
                 "success": False,
-                "error": f"No {fiware_type} sensor found within {radius}m of ({latitude}, {longitude})",
+                "error": f"No {sensor_type} sensor found within {radius}m of ({latitude}, {longitude})",
             }
         entity = entities[0]
-        print(f"[FIWARE] Found sensor: {entity.get('id', 'unknown')}")
+        logger.debug("[FIWARE] Found sensor: %s", entity.get("id", "unknown"))
         return {
             "success": True,
-            "entity_type": fiware_type,
+            "entity_type": sensor_type,
             "entity": entity,
             "query_location": {"latitude": latitude, "longitude": longitude},
         }
@@ -615,12 +635,12 @@ class FIWAREClient:
 
     # ---- get_types (L28 collapsed fallback) ------------------------------
     async def aget_types(self) -> Dict[str, Any]:
-        url = f"{self.base_url}/types"
+        url = self._types_url
         # L28 — ONE request only. If the primary endpoint 404s, skip the
         # retry (don't make a second call with the same body); return
         # {"found": false, "reason": "types_endpoint_missing"} instead.
         params = {"options": "values"}
-        headers = {**self._headers, "Accept": "application/json"}
+        headers = self._types_headers
         client = self._async_client()
         try:
             response = await _aretry_call(
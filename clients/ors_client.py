@@ -7,6 +7,7 @@ client only. Callers ALWAYS pass `lat, lon`.
 """
 
 import asyncio
+import logging
 import threading
 import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
@@ -16,6 +17,8 @@ import httpx
 
 from models import Coordinates
 
+logger = logging.getLogger(__name__)
+
 try:  # services/thresholds.py is owned by a sibling agent — optional import.
     from services.thresholds import CACHE_TTL_SECONDS as _DEFAULT_CACHE_TTL
 except Exception:  # pragma: no cover
@@ -33,6 +36,19 @@ try:
 except Exception:  # pragma: no cover
     _HAS_TENACITY = False
 
+# orjson parses large bodies several times faster than httpx's stdlib-based
+# `response.json()`; its decode error subclasses ValueError. Falls back to json.
+try:
+    import orjson
+
+    def _loads(content: bytes) -> Any:
+        return orjson.loads(content)
+except ImportError:  # pragma: no cover
+    import json
+
+    def _loads(content: bytes) -> Any:
+        return json.loads(content)
+
 
 _SHARED_TIMEOUT = httpx.Timeout(connect=5.0, read=10.0, write=10.0, pool=5.0)
 _SHARED_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=50)
@@ -67,6 +83,8 @@ def _assert_magdeburg_bounds(lat: float, lon: float) -> None:
 
 # --- TTL response cache ----------------------------------------------------
 class _TTLCache:
+    __slots__ = ("ttl", "_store", "_lock")
+
     def __init__(self, ttl_seconds: float) -> None:
         self.ttl = ttl_seconds
         self._store: Dict[tuple, tuple] = {}
@@ -286,6 +304,11 @@ class ORSClient:
             "driving": "driving-car",
             "wheelchair": "wheelchair",
         }
+        # Fixed endpoint URLs, built once instead of per request.
+        self._geocode_url = f"{self.base_url}/geocode/search"
+        self._directions_urls = {
+            p: f"{self.base_url}/v2/directions/{p}" for p in self.profiles.values()
+        }
 
     @classmethod
     def _async_client(cls) -> httpx.AsyncClient:
@@ -332,7 +355,7 @@ class ORSClient:
         try:
             _assert_magdeburg_bounds(focus_lat, focus_lon)
         except ValueError as exc:
-            print(f"ORS geocode bounds error: {exc}")
+            logger.warning(f"ORS geocode bounds error: {exc}")
             return None
         params = {
             "api_key": self.api_key,
@@ -342,7 +365,7 @@ class ORSClient:
             "focus.point.lon": focus_lon,
             "boundary.country": "DE",
         }
-        url = f"{self.base_url}/geocode/search"
+        url = self._geocode_url
         key = _cache_key(url, params)
         cached = _ors_cache.get(key)
         if cached is not None:
@@ -353,11 +376,11 @@ class ORSClient:
                 lambda: client.get(url, params=params, headers=self._headers)
             )
         except Exception as exc:  # noqa: BLE001
-            print(f"ORS Geocoding error: {exc}")
+            logger.warning(f"ORS Geocoding error: {exc}")
             return None
         if response.status_code != 200:
             return None
-        data = response.json()
+        data = _loads(response.content)
         # H23 — require non-empty features list.
         features = data.get("features")
         if not isinstance(features, list) or not features:
@@ -419,7 +442,7 @@ class ORSClient:
     async def aget_route(self, start_coords: Coordinates, end_coords: Coordinates,
                          profile: str = "walking") -> Optional[Dict]:
         ors_profile = self.profiles.get(profile, "foot-walking")
-        url = f"{self.base_url}/v2/directions/{ors_profile}"
+        url = self._directions_urls[ors_profile]
         try:
             payload = self._build_route_payload(start_coords, end_coords, instructions=False)
         except ValueError as exc:
@@ -442,12 +465,12 @@ class ORSClient:
         except httpx.TimeoutException:
             return {"success": False, "error": "ORS request timed out"}
         except Exception as exc:  # noqa: BLE001
-            print(f"ORS route error: {exc}")
+            logger.warning(f"ORS route error: {exc}")
             return {"success": False, "error": str(exc)}
         if response.status_code != 200:
             return {"success": False, "error": f"ORS API error: {response.status_code}"}
         try:
-            data = response.json()
+            data = _loads(response.content)
         except Exception as exc:
             return {"success": False, "error": f"ORS returned invalid JSON: {exc}"}
         result = self._parse_route_response(data, profile)
@@ -530,7 +553,7 @@ class ORSClient:
         profile: str = "driving", max_steps: int = 4,
     ) -> Optional[Dict]:
         ors_profile = self.profiles.get(profile, "driving-car")
-        url = f"{self.base_url}/v2/directions/{ors_profile}"
+        url = self._directions_urls[ors_profile]
         try:
             payload = self._build_route_payload(start_coords, end_coords, instructions=True)
         except ValueError as exc:
@@ -544,12 +567,12 @@ class ORSClient:
         except httpx.TimeoutException:
             return {"success": False, "error": "ORS request timed out"}
         except Exception as exc:  # noqa: BLE001
-            print(f"ORS directions error: {exc}")
+            logger.warning(f"ORS directions error: {exc}")
             return {"success": False, "error": str(exc)}
         if response.status_code != 200:
             return {"success": False, "error": f"ORS API error: {response.status_code}"}
         try:
-            data = response.json()
+            data = _loads(response.content)
         except Exception as exc:
             return {"success": False, "error": f"ORS returned invalid JSON: {exc}"}
         return self._parse_directions_response(data, profile, max_steps)
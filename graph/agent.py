@@ -27,6 +27,12 @@ from graph.system_prompt import get_system_prompt
 
 logger = logging.getLogger(__name__)
 
+# Fixed user-facing fallbacks, built once. api.py reuses TIMEOUT_REPLY for the
+# streaming path so both paths say the same thing.
+TIMEOUT_REPLY = "Sorry, that took longer than expected to look up. Please try again."
+ERROR_REPLY = "Sorry, I ran into an internal error answering that. Please try again."
+EMPTY_REPLY = "Sorry, I couldn't put together an answer for that one."
+
 
 def build_single_agent(tools: Any):
     """Build the single gpt-5.4 ReAct agent on the given MCP tools.
@@ -38,7 +44,7 @@ def build_single_agent(tools: Any):
     """
     all_tools = list(tools)
     tool_names = [getattr(t, "name", "?") for t in all_tools]
-    print(f"[SINGLE AGENT] Using {len(all_tools)} MCP tools: {tool_names}")
+    logger.info(f"[SINGLE AGENT] Using {len(all_tools)} MCP tools: {tool_names}")
 
     llm = ChatOpenAI(
         base_url=OPENAI_BASE_URL,
@@ -49,7 +55,7 @@ def build_single_agent(tools: Any):
     )
 
     prompt = get_system_prompt()
-    print(f"[SINGLE AGENT] System prompt ready ({len(prompt)} chars)")
+    logger.info(f"[SINGLE AGENT] System prompt ready ({len(prompt)} chars)")
 
     agent = create_react_agent(llm, all_tools, prompt=prompt)
     return agent, tool_names
@@ -113,7 +119,7 @@ def create_single_agent_node(agent):
         parts.append(f"Question: {query}")
         user_msg = "\n\n".join(parts)
 
-        print(f"[SINGLE AGENT] Processing: {query!r}")
+        logger.info(f"[SINGLE AGENT] Processing: {query!r}")
 
         try:
             result = await asyncio.wait_for(
@@ -121,31 +127,29 @@ def create_single_agent_node(agent):
                 timeout=AGENT_TIMEOUT,
             )
         except asyncio.TimeoutError:
-            print(f"[SINGLE AGENT] Timeout after {AGENT_TIMEOUT}s")
-            msg = "Sorry, that took longer than expected to look up. Please try again."
-            return {"response": msg, "final_response": msg}
+            logger.warning(f"[SINGLE AGENT] Timeout after {AGENT_TIMEOUT}s")
+            return {"response": TIMEOUT_REPLY, "final_response": TIMEOUT_REPLY}
         except Exception as e:
-            logger.error(f"Single agent failed: {e}", exc_info=True)
-            print(f"[SINGLE AGENT] Error: {e}")
-            msg = "Sorry, I ran into an internal error answering that. Please try again."
-            return {"response": msg, "final_response": msg}
+            logger.error(f"[SINGLE AGENT] Error: {e}", exc_info=True)
+            return {"response": ERROR_REPLY, "final_response": ERROR_REPLY}
 
         msgs = result.get("messages") or []
 
-        # Diagnostic: print every tool call (with args) and every tool
-        # result (truncated). Helps catch cases where the LLM misreads a
-        # successful tool result as a failure, or calls the wrong tool.
-        for i, m in enumerate(msgs):
-            cls = type(m).__name__
-            tcs = getattr(m, "tool_calls", None)
-            if tcs:
-                for tc in tcs:
-                    args_preview = str(tc.get("args", {}))[:300]
-                    print(f"[SINGLE AGENT]   step {i} {cls} -> {tc.get('name')}({args_preview})")
-            elif cls == "ToolMessage":
-                content = getattr(m, "content", "") or ""
-                preview = (content[:400] + "...") if len(content) > 400 else content
-                print(f"[SINGLE AGENT]   step {i} ToolMessage <- {preview}")
+        # Diagnostic: log every tool call (with args) and every tool
+        # result (truncated) at DEBUG. Helps catch cases where the LLM misreads
+        # a successful tool result as a failure, or calls the wrong tool.
+        if logger.isEnabledFor(logging.DEBUG):
+            for i, m in enumerate(msgs):
+                cls = type(m).__name__
+                tcs = getattr(m, "tool_calls", None)
+                if tcs:
+                    for tc in tcs:
+                        args_preview = str(tc.get("args", {}))[:300]
+                        logger.debug(f"[SINGLE AGENT]   step {i} {cls} -> {tc.get('name')}({args_preview})")
+                elif cls == "ToolMessage":
+                    content = getattr(m, "content", "") or ""
+                    preview = (content[:400] + "...") if len(content) > 400 else content
+                    logger.debug(f"[SINGLE AGENT]   step {i} ToolMessage <- {preview}")
 
         final = ""
         for m in reversed(msgs):
@@ -156,10 +160,10 @@ def create_single_agent_node(agent):
                     break
 
         if not final:
-            final = "Sorry, I couldn't put together an answer for that one."
+            final = EMPTY_REPLY
 
         n_tool_calls = _count_tool_calls(msgs)
-        print(
+        logger.info(
             f"[SINGLE AGENT] Done — {n_tool_calls} tool call(s), "
             f"{len(final)} char answer"
         )
@@ -19,6 +19,7 @@ used to be a supervisor + 4 specialist agents + synthesis pipeline.
 
 from __future__ import annotations
 
+import logging
 from typing import Any
 
 from langgraph.graph import END, START, StateGraph
@@ -28,6 +29,8 @@ from graph.nodes.cache_node import create_cache_nodes
 from graph.nodes.proactive_node import create_proactive_node
 from graph.state import AgentState
 
+logger = logging.getLogger(__name__)
+
 
 def _route_after_cache(state: AgentState) -> str:
     """Cache hit → straight to END. Miss → proactive bridge → single agent."""
@@ -81,5 +84,5 @@ def build_graph(
     g.add_edge("cache_store", END)
 
     app = g.compile(checkpointer=checkpointer)
-    print("[GRAPH] Pipeline compiled (cache_check → proactive → single_agent → cache_store)")
+    logger.info("[GRAPH] Pipeline compiled (cache_check → proactive → single_agent → cache_store)")
     return app
@@ -14,6 +14,7 @@ bound to the live session. Closing the stack tears the subprocesses down.
 
 from __future__ import annotations
 
+import logging
 import os
 import sys
 from contextlib import AsyncExitStack
@@ -22,6 +23,8 @@ from langchain_core.tools import BaseTool
 from langchain_mcp_adapters.client import MultiServerMCPClient
 from langchain_mcp_adapters.tools import load_mcp_tools
 
+logger = logging.getLogger(__name__)
+
 _PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
 # server name -> module file under mcp_servers/
@@ -65,7 +68,7 @@ async def open_mcp_tools(
         server_tools = await load_mcp_tools(session)
         per_server[name] = [t.name for t in server_tools]
         tools.extend(server_tools)
-    print(f"[MCP] persistent sessions up; tools per server: {per_server}")
+    logger.info(f"[MCP] persistent sessions up; tools per server: {per_server}")
     return tools, per_server
 
 
@@ -10,10 +10,13 @@ edge can short-circuit straight to END and downstream nodes (router,
 sub-agents, synthesiser) see `cache_hit=True` and can bail out.
 """
 
+import logging
 from typing import Optional, Tuple
 
 from graph.nodes._models import CacheCheckResult
 
+logger = logging.getLogger(__name__)
+
 # Try to pull shared thresholds; fall back to safe defaults so the node is
 # still callable even if services/thresholds.py isn't on the path yet.
 try:
@@ -106,12 +109,12 @@ def create_cache_nodes(semantic_cache):
         try:
             cached = _cache_get_compat(semantic_cache, query, user_id, location)
         except Exception as e:
-            print(f"[CACHE] get() failed: {e}")
+            logger.warning(f"[CACHE] get() failed: {e}")
             cached = None
 
         if cached is not None:
             response = cached.get("response", "") or ""
-            print(f"[CACHE] Hit for: {query[:50]}... (user={user_id})")
+            logger.info(f"[CACHE] Hit for: {query[:50]}... (user={user_id})")
             result = CacheCheckResult(
                 cache_hit=True,
                 response=response,
@@ -119,7 +122,7 @@ def create_cache_nodes(semantic_cache):
             )
             return result.model_dump(exclude_none=True)
 
-        print(f"[CACHE] Miss (user={user_id})")
+        logger.debug("[CACHE] Miss (user=%s)", user_id)
         return CacheCheckResult(cache_hit=False).model_dump(exclude_none=True)
 
     def cache_store(state: dict) -> dict:
@@ -149,11 +152,14 @@ def create_cache_nodes(semantic_cache):
                 user_id,
                 location,
             )
-            stats = semantic_cache.get_stats()
-            print(f"[CACHE] Stored ({stats['size']} entries, "
-                  f"{stats['hit_rate']:.0%} hit rate)")
+            # get_stats() takes the cache lock; only pay for it when the
+            # debug line will actually be emitted.
+            if logger.isEnabledFor(logging.DEBUG):
+                stats = semantic_cache.get_stats()
+                logger.debug(f"[CACHE] Stored ({stats['size']} entries, "
+                             f"{stats['hit_rate']:.0%} hit rate)")
         except Exception as e:
-            print(f"[CACHE] put() failed: {e}")
+            logger.warning(f"[CACHE] put() failed: {e}")
 
         return {}
 
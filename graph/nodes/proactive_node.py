@@ -19,8 +19,11 @@ sensor must never block or fail the agent turn.
 from __future__ import annotations
 
 import asyncio
+import logging
 from datetime import datetime, timezone
 
+logger = logging.getLogger(__name__)
+
 _BRANCH_TIMEOUT_SECONDS = 3.0
 _RADIUS_M = 800
 
@@ -112,7 +115,7 @@ def create_proactive_node(fiware_client):
             f"at lat={lat:.5f}, lon={lon:.5f}). Mention only what's relevant to "
             f"their question, naturally: " + "; ".join(bits) + "."
         )
-        print(f"[PROACTIVE] {ctx}")
+        logger.debug("[PROACTIVE] %s", ctx)
         return {"proactive_context": ctx}
 
     return proactive_node
@@ -20,12 +20,12 @@ from mcp_servers.neo4j_server import build_structural_schema, build_value_catalo
 logger = logging.getLogger(__name__)
 
 
-_ALLOWED_LABELS = [
+_ALLOWED_LABELS = (
     "Stop", "Line", "Street", "Landmark", "Area",
     "Building", "POI",
-]
+)
 
-_ALLOWED_RELATIONSHIPS = [
+_ALLOWED_RELATIONSHIPS = (
     "SERVED_BY", "NEXT_STOP", "WALKING_DISTANCE", "BORDERED_BY",
     "SAME_STRUCTURE", "CONNECTED_INTERNALLY", "CONTIGUOUS_TO",
     "PROVIDES_COOLING_TO", "RECEIVES_COOLING_FROM", "SURROUNDS",
@@ -34,7 +34,7 @@ _ALLOWED_RELATIONSHIPS = [
     "NEAR_BUILDING", "ON_STREET", "INTERSECTS", "NEARBY",
     "ADJACENT_TO", "NEAREST_BUILDING", "ACCESSIBLE_ROUTE",
     "ACCESSIBLE_STOP", "IN_BUILDING",
-]
+)
 
 
 SYSTEM_PROMPT_TEMPLATE = """You are the Magdeburg Campus Assistant — a mobility and information agent for Otto-von-Guericke University (OVGU) campus and Magdeburg city.
@@ -330,11 +330,12 @@ def refresh_schema_cache() -> dict:
         "prompt_chars": len(_CACHED_PROMPT),
     }
     logger.info(f"[SYSTEM PROMPT] cache refreshed: {info}")
-    print(f"[SYSTEM PROMPT] cache refreshed: {info}")
     # Diagnostic dump — first 600 chars of the live schema text so we can
     # spot empty / partial introspection results before they confuse the LLM.
-    schema_preview = schema[:600] if schema else "(empty)"
-    print(f"[SYSTEM PROMPT] schema preview ↓\n{schema_preview}\n[SYSTEM PROMPT] schema preview ↑")
+    logger.debug(
+        "[SYSTEM PROMPT] schema preview ↓\n%s\n[SYSTEM PROMPT] schema preview ↑",
+        schema[:600] if schema else "(empty)",
+    )
     return info
 
 
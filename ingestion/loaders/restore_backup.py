@@ -10,6 +10,8 @@ Two-phase load:
      can resolve relationship endpoints in phase 2.
   2. Create all relationships, matching endpoints by `_backup_id`.
   3. Drop the `_backup_id` markers afterwards.
+  4. Give every Stop a native POINT `location` and create the `stop_location`
+     point index that the nearest-stop lookup in neo4j_tools reads.
 
 Target by default is the local staging instance (NEO4J_STAGING_*). Pass --production
 to target the Aura production vars (NEO4J_*). The script refuses to write into a
@@ -127,6 +129,16 @@ def main() -> None:
                 "{batchSize: 1000})"
             )
 
+            print("Phase 4: stop locations + point index...")
+            session.run(
+                "MATCH (s:Stop) WHERE s.location IS NULL "
+                "AND s.latitude IS NOT NULL AND s.longitude IS NOT NULL "
+                "SET s.location = point({latitude: s.latitude, longitude: s.longitude})"
+            ).consume()
+            session.run(
+                "CREATE POINT INDEX stop_location IF NOT EXISTS FOR (s:Stop) ON (s.location)"
+            ).consume()
+
             final_nodes = session.run("MATCH (n) RETURN count(n) AS c").single()["c"]
             final_rels = session.run("MATCH ()-[r]->() RETURN count(r) AS c").single()["c"]
             print()
@@ -4,9 +4,29 @@ Kept in sync with graph/agents/_direct_tools.py so the MCP path and the
 in-process path classify and name congestion identically.
 """
 
+import bisect
+import functools
 import math
 import re
 
+import numpy as np
+
+_EARTH_RADIUS_M = 6371000.0
+
+# German letters folded to their ASCII spellings in one str.translate pass.
+_STREET_FOLD = str.maketrans({"ß": "ss", "ä": "ae", "ö": "oe", "ü": "ue"})
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9]")
+
+# Congestion bands in increasing severity; the rank is the index, so "worst
+# of" is an integer max instead of chained string comparisons.
+CONGESTION_LEVELS = ("clear", "moderate", "heavy")
+CONGESTION_RANK = {level: i for i, level in enumerate(CONGESTION_LEVELS)}
+
+# speed/limit cut points and the band each bin maps to, so classifying a
+# live reading is one bisect over a tuple instead of an if/elif chain.
+_RATIO_CUTS = (0.5, 0.75)
+_BAND_BY_BIN = ("heavy", "moderate", "clear")
+
 
 def summarize_traffic_entity(entity: dict) -> dict:
     """Compact congestion summary from a FIWARE Traffic entity (keyValues shape).
@@ -22,12 +42,8 @@ def summarize_traffic_entity(entity: dict) -> dict:
                               and isinstance(limit, (int, float)) and limit) else None
     if ratio is None:
         congestion, basis = "clear", "no_slowdowns_reported"
-    elif ratio < 0.5:
-        congestion, basis = "heavy", "live_speed"
-    elif ratio < 0.75:
-        congestion, basis = "moderate", "live_speed"
     else:
-        congestion, basis = "clear", "live_speed"
+        congestion, basis = _BAND_BY_BIN[bisect.bisect_right(_RATIO_CUTS, ratio)], "live_speed"
     return {
         "segment": entity.get("id"),
         "speed_limit_kmh": limit,
@@ -38,20 +54,77 @@ def summarize_traffic_entity(entity: dict) -> dict:
     }
 
 
+@functools.lru_cache(maxsize=1024)
 def normalize_street_name(name: str) -> str:
-    """'Gustav-Adolf-Straße' and 'GustavAdolfStrasse' both -> 'gustavadolfstrasse'."""
+    """'Gustav-Adolf-Straße' and 'GustavAdolfStrasse' both -> 'gustavadolfstrasse'.
+
+    Memoised: street and segment names come from a small fixed set and are
+    re-normalised on every route traffic check.
+    """
     if not name:
         return ""
-    s = name.lower()
-    s = s.replace("ß", "ss").replace("ä", "ae").replace("ö", "oe").replace("ü", "ue")
-    return re.sub(r"[^a-z0-9]", "", s)
+    return _NON_ALNUM_RE.sub("", name.lower().translate(_STREET_FOLD))
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_latlon_str(loc: str) -> tuple:
+    lat, sep, rest = loc.partition(",")
+    if not sep:
+        return None, None
+    try:
+        return float(lat), float(rest.partition(",")[0])
+    except ValueError:
+        return None, None
+
+
+def _latlon_pair(lat, lon) -> tuple:
+    try:
+        return float(lat), float(lon)
+    except (TypeError, ValueError):
+        return None, None
+
+
+def parse_geo_point(loc) -> tuple:
+    """(lat, lon) from a FIWARE `location`: a "lat,lon" string, a GeoJSON
+    point dict, or a {latitude, longitude} dict. (None, None) when unusable,
+    including when only one of the two coordinates is present or numeric.
+
+    Sensors are fixed, so the same location strings come back on every poll;
+    the string parse is memoised and uses partition (no split list).
+    """
+    if isinstance(loc, str):
+        return _parse_latlon_str(loc)
+    if isinstance(loc, dict):
+        coords = loc.get("coordinates")
+        if isinstance(coords, list) and len(coords) >= 2:
+            return _latlon_pair(coords[1], coords[0])
+        if "latitude" in loc:
+            return _latlon_pair(loc["latitude"], loc.get("longitude"))
+    return None, None
 
 
 def haversine_m(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     """Great-circle distance in metres between two WGS84 points."""
-    r = 6371000.0
+    r = _EARTH_RADIUS_M
     p1, p2 = math.radians(lat1), math.radians(lat2)
     dphi = math.radians(lat2 - lat1)
     dlmb = math.radians(lon2 - lon1)
     a = math.sin(dphi / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dlmb / 2) ** 2
     return 2 * r * math.asin(math.sqrt(a))
+
+
+def haversine_many_m(lat: float, lon: float, lats, lons) -> np.ndarray:
+    """Vectorised haversine_m: metres from one point to each of many points.
+
+    One numpy expression over the whole candidate set instead of a Python
+    math loop per entity; pair with ``argmin()`` / a mask for nearest / radius.
+    A single candidate (one sensor on a street, one lot) takes the scalar path
+    and skips the half-dozen array temporaries.
+    """
+    if len(lats) == 1:
+        return np.array([haversine_m(lat, lon, lats[0], lons[0])])
+    p1 = math.radians(lat)
+    p2 = np.radians(np.asarray(lats, dtype=np.float64))
+    dlmb = np.radians(np.asarray(lons, dtype=np.float64)) - math.radians(lon)
+    a = np.sin((p2 - p1) / 2) ** 2 + math.cos(p1) * np.cos(p2) * np.sin(dlmb / 2) ** 2
+    return 2 * _EARTH_RADIUS_M * np.arcsin(np.sqrt(a))
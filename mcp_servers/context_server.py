@@ -4,7 +4,9 @@ Bridges Neo4j (location resolution), FIWARE (real-time sensors), and
 ORS (walking distance) to provide unified spatial context in one tool call.
 """
 
+import functools
 import json
+import logging
 import sys
 import os
 import time
@@ -17,6 +19,7 @@ from neo4j import GraphDatabase, Query
 from clients.fiware_client import FIWAREClient
 from clients.ors_client import ORSClient
 from models import Coordinates
+from mcp_servers._traffic_helpers import haversine_many_m, parse_geo_point
 from config import (
     NEO4J_URI, NEO4J_USERNAME, NEO4J_PASSWORD, NEO4J_DATABASE,
     FIWARE_BASE_URL, FIWARE_API_KEY,
@@ -86,7 +89,16 @@ def _neo4j_read(cypher: str, params: dict = None, timeout: float = _DEFAULT_QUER
 
 def _resolve_location(name: str) -> dict | None:
     """Resolve a location name to coordinates via Neo4j (searches all node types)."""
-    search = name.lower()
+    row = _resolve_location_cached(name.lower())
+    return dict(row) if row else None
+
+
+@functools.lru_cache(maxsize=512)
+def _resolve_location_cached(search: str) -> dict | None:
+    # The lookup is an unindexed CONTAINS scan over every node, and its answer
+    # only changes when the graph is re-imported, so repeated place names (the
+    # common case across sessions) are memoised per server process. Driver
+    # errors propagate and are not cached. Callers get a copy of the row.
     rows = _neo4j_read("""
         MATCH (n)
         WHERE (toLower(n.name) CONTAINS $search
@@ -102,22 +114,7 @@ def _resolve_location(name: str) -> dict | None:
 
 def _parse_fiware_location(loc) -> tuple:
     """Extract (lat, lon) from various FIWARE location formats."""
-    if isinstance(loc, dict):
-        # GeoJSON: {"type": "Point", "coordinates": [lon, lat]}
-        coords = loc.get("coordinates")
-        if isinstance(coords, list) and len(coords) >= 2:
-            return coords[1], coords[0]
-        # Direct: {"latitude": ..., "longitude": ...}
-        if "latitude" in loc:
-            return loc["latitude"], loc["longitude"]
-    if isinstance(loc, str) and "," in loc:
-        # String: "52.137601, 11.637394"
-        parts = loc.split(",")
-        try:
-            return float(parts[0].strip()), float(parts[1].strip())
-        except ValueError:
-            pass
-    return None, None
+    return parse_geo_point(loc)
 
 
 def _query_fiware_sensor(lat: float, lon: float, sensor_type: str, radius: int) -> dict:
@@ -252,23 +249,24 @@ def get_nearby_context(location: str, radius: int = 1000) -> str:
         parking_data = parking.get("data", {})
         parking_loc = parking_data.get("location", {})
         p_lat, p_lon = _parse_fiware_location(parking_loc)
-        if p_lat and p_lon:
+        if p_lat is not None and p_lon is not None:
             walking_to_parking = _get_walking_distance(lat, lon, p_lat, p_lon)
     else:
         # No parking in radius. Pull all Parking entities and compute distances.
-        import math
         all_parking = _fiware.query_entities(entity_type="Parking", limit=50)
         if all_parking.get("success"):
-            candidates = []
+            located, lats, lons = [], [], []
             for e in all_parking.get("entities", []):
                 p_lat, p_lon = _parse_fiware_location(e.get("location"))
                 if p_lat is None or p_lon is None:
                     continue
-                # Approx distance (haversine-ish, fine for <10km)
-                dlat = math.radians(p_lat - lat)
-                dlon = math.radians(p_lon - lon)
-                a = math.sin(dlat/2)**2 + math.cos(math.radians(lat)) * math.cos(math.radians(p_lat)) * math.sin(dlon/2)**2
-                dist_m = 6371000 * 2 * math.asin(math.sqrt(a))
+                located.append(e)
+                lats.append(p_lat)
+                lons.append(p_lon)
+            dists = haversine_many_m(lat, lon, lats, lons) if located else []
+            candidates = []
+            for e, dist_m in zip(located, dists):
+                dist_m = float(dist_m)
                 candidates.append({
                     "id": e.get("id"),
                     "name": e.get("name"),
@@ -332,4 +330,7 @@ def get_nearby_context(location: str, radius: int = 1000) -> str:
 # Entry point
 # ---------------------------------------------------------------------------
 if __name__ == "__main__":
+    # stdout carries the MCP stdio protocol, so log records (e.g. Neo4j
+    # traces from neo4j_tools) go to stderr.
+    logging.basicConfig(stream=sys.stderr, level=logging.INFO)
     mcp.run(transport="stdio")
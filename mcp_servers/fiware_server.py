@@ -5,6 +5,7 @@ sensor data: weather, parking, air quality, traffic, room sensors.
 """
 
 import json
+import logging
 import sys
 import os
 import time
@@ -37,7 +38,10 @@ mcp = FastMCP("fiware-sensors", instructions=(
 # Neo4j — kept out of this server to avoid confusion.
 # ---------------------------------------------------------------------------
 from mcp_servers._sensor_types import REALTIME_TYPES
-from mcp_servers._traffic_helpers import summarize_traffic_entity, haversine_m
+from mcp_servers._traffic_helpers import (
+    CONGESTION_LEVELS, CONGESTION_RANK, summarize_traffic_entity, haversine_many_m,
+    parse_geo_point,
+)
 _REALTIME_TYPES_SORTED = sorted(REALTIME_TYPES)
 
 # ---------------------------------------------------------------------------
@@ -391,30 +395,32 @@ def get_traffic_flow(latitude: float, longitude: float, radius: int = 300) -> st
             "note": "No live traffic readings available right now — present as clear / no delays.",
         })
 
-    near = []
+    located, lats, lons = [], [], []
     for ent in res.get("entities", []):
         if not isinstance(ent, dict):
             continue
         loc = ent.get("location")
-        if not (isinstance(loc, str) and "," in loc):
+        if not isinstance(loc, str):
             continue
-        parts = loc.split(",")
-        try:
-            la, lo = float(parts[0]), float(parts[1])
-        except (ValueError, IndexError):
+        la, lo = parse_geo_point(loc)
+        if la is None or lo is None:
             continue
-        if haversine_m(lat_f, lon_f, la, lo) <= radius:
-            near.append(summarize_traffic_entity(ent))
+        located.append(ent)
+        lats.append(la)
+        lons.append(lo)
+    near = []
+    if located:
+        in_radius = haversine_many_m(lat_f, lon_f, lats, lons) <= radius
+        near = [summarize_traffic_entity(ent) for ent, ok in zip(located, in_radius) if ok]
 
-    worst = "clear"
+    worst = 0
     slowdowns = []
     for summ in near:
         cong = summ.get("congestion")
-        if cong == "heavy":
-            worst = "heavy"
-        elif cong == "moderate" and worst != "heavy":
-            worst = "moderate"
-        if cong in ("heavy", "moderate"):
+        rank = CONGESTION_RANK.get(cong, 0)
+        if rank > worst:
+            worst = rank
+        if rank:
             slowdowns.append({
                 "street": str(summ.get("segment", "")).split(":", 1)[-1],
                 "congestion": cong,
@@ -429,7 +435,7 @@ def get_traffic_flow(latitude: float, longitude: float, radius: int = 300) -> st
             "Live slowdown(s) reported on the listed street(s); mention the worst one.")
     return json.dumps({
         "success": True, "found": True, "source": "fiware",
-        "congestion": worst,
+        "congestion": CONGESTION_LEVELS[worst],
         "basis": "live_speed" if near else "no_slowdowns_reported",
         "radius_m": radius,
         "live_segments_in_radius": len(near),
@@ -442,4 +448,7 @@ def get_traffic_flow(latitude: float, longitude: float, radius: int = 300) -> st
 # Entry point
 # ---------------------------------------------------------------------------
 if __name__ == "__main__":
+    # stdout carries the MCP stdio protocol, so log records (e.g. Neo4j
+    # traces from neo4j_tools) go to stderr.
+    logging.basicConfig(stream=sys.stderr, level=logging.INFO)
     mcp.run(transport="stdio")
@@ -4,7 +4,9 @@ Exposes raw Cypher execution, schema introspection, and search tools
 so that a ReAct agent can autonomously query the campus graph database.
 """
 
+import functools
 import json
+import logging
 import re
 import sys
 import os
@@ -51,11 +53,17 @@ _driver = GraphDatabase.driver(
 )
 
 
-def _run_read(cypher: str, params: dict = None, timeout: float = _DEFAULT_QUERY_TIMEOUT) -> list[dict]:
+def _run_read(cypher: str, params: dict = None, timeout: float = _DEFAULT_QUERY_TIMEOUT,
+              session=None) -> list[dict]:
     """Execute a read-only Cypher query and return results as list of dicts.
 
     `timeout` is a per-query server-side timeout (seconds) enforced by Neo4j.
+    Pass an open `session` to run inside a caller's unit of work (several
+    queries, one session) instead of opening a fresh one per query.
     """
+    if session is not None:
+        result = session.run(_q(cypher, timeout=timeout), parameters=params or {})
+        return [dict(record) for record in result]
     with _driver.session(database=NEO4J_DATABASE) as session:
         result = session.run(_q(cypher, timeout=timeout), parameters=params or {})
         return [dict(record) for record in result]
@@ -392,12 +400,17 @@ _VALID_REL_TYPES = frozenset({
     "NEAR_BUILDING", "ON_STREET", "INTERSECTS", "NEARBY", "ADJACENT_TO",
     "NEAREST_BUILDING", "ACCESSIBLE_ROUTE", "ACCESSIBLE_STOP",
 })
+_VALID_LABELS_SORTED = sorted(_VALID_LABELS)
+_VALID_REL_TYPES_SORTED = sorted(_VALID_REL_TYPES)
 
 # Patterns to pull out label/reltype references from a Cypher source string.
 # Labels appear as `:Label` — possibly followed by `|:Other` for alternatives.
 # Rel types appear as `[:REL]`, `[r:REL]`, `[r:REL|OTHER]`, `[r:REL*1..3]`, etc.
 _LABEL_RE = re.compile(r":([A-Z][A-Za-z0-9_]*)")
 _REL_RE = re.compile(r"\[[^\]]*?:([A-Z_][A-Z0-9_]*(?:\s*\|\s*:?[A-Z_][A-Z0-9_]*)*)")
+# Line (// ...) and block (/* ... */) comments, stripped before scanning.
+_LINE_COMMENT_RE = re.compile(r"//.*?$", re.MULTILINE)
+_BLOCK_COMMENT_RE = re.compile(r"/\*.*?\*/", re.DOTALL)
 
 # Write/side-effect verbs disallowed for LLM queries (top-level; case-insensitive).
 _WRITE_VERBS_RE = re.compile(
@@ -411,12 +424,10 @@ def _extract_labels_and_rels(cypher: str) -> tuple[set[str], set[str]]:
     contain alternatives (`[:A|B]`) or quantifiers (`[:A*1..3]`) — split on
     `|` and strip variable-length parts so we only classify bare type names."""
     # Strip line comments // ... and block comments /* ... */ cheaply.
-    cleaned = re.sub(r"//.*?$", " ", cypher, flags=re.MULTILINE)
-    cleaned = re.sub(r"/\*.*?\*/", " ", cleaned, flags=re.DOTALL)
+    cleaned = _LINE_COMMENT_RE.sub(" ", cypher)
+    cleaned = _BLOCK_COMMENT_RE.sub(" ", cleaned)
 
-    labels: set[str] = set()
-    for m in _LABEL_RE.finditer(cleaned):
-        labels.add(m.group(1))
+    labels: set[str] = set(_LABEL_RE.findall(cleaned))
 
     rels: set[str] = set()
     for m in _REL_RE.finditer(cleaned):
@@ -450,8 +461,9 @@ def _validate_cypher_allow_list(query: str) -> dict | None:
         }
 
     labels, rels = _extract_labels_and_rels(query)
-    invalid_labels = sorted(l for l in labels if l not in _VALID_LABELS)
-    invalid_rels = sorted(r for r in rels if r not in _VALID_REL_TYPES)
+    # C-level set differences against the frozen allow-lists.
+    invalid_labels = sorted(labels - _VALID_LABELS)
+    invalid_rels = sorted(rels - _VALID_REL_TYPES)
 
     if invalid_labels or invalid_rels:
         return {
@@ -460,8 +472,8 @@ def _validate_cypher_allow_list(query: str) -> dict | None:
                 "labels": invalid_labels,
                 "relationship_types": invalid_rels,
             },
-            "valid_labels": sorted(_VALID_LABELS),
-            "valid_relationship_types": sorted(_VALID_REL_TYPES),
+            "valid_labels": _VALID_LABELS_SORTED,
+            "valid_relationship_types": _VALID_REL_TYPES_SORTED,
         }
     return None
 
@@ -529,7 +541,7 @@ def execute_cypher(query: str, params: str = "{}") -> str:
         return json.dumps({"error": f"Cypher execution failed: {e}"})
 
 
-def _get_line_direction(line: str, seg_from: str, seg_to: str) -> str | None:
+def _get_line_direction(line: str, seg_from: str, seg_to: str, session=None) -> str | None:
     """Get the travel direction (terminal stop name) from NEXT_STOP edge direction property.
 
     A stop can have outgoing edges for the same line in BOTH directions (northbound
@@ -542,7 +554,7 @@ def _get_line_direction(line: str, seg_from: str, seg_to: str) -> str | None:
         RETURN rels[0].direction AS direction, size(rels) AS hops
         ORDER BY hops
         LIMIT 1
-    """, {"from": seg_from, "to": seg_to, "line": line}, timeout=12.0)
+    """, {"from": seg_from, "to": seg_to, "line": line}, timeout=12.0, session=session)
     if result and result[0].get("direction"):
         # Format is "Origin → Terminal" — extract terminal
         parts = result[0]["direction"].split("→")
@@ -635,7 +647,7 @@ _TRANSIT_SHORTEST_Q = """
 """
 
 
-def _find_best_path(o: str, d: str) -> dict | None:
+def _find_best_path(o: str, d: str, session=None) -> dict | None:
     """Find the best transit path from stop `o` to stop `d`.
 
     Tries direct (0 transfers) -> 1 transfer -> shortestPath fallback as
@@ -645,11 +657,11 @@ def _find_best_path(o: str, d: str) -> dict | None:
     early-exit on the first hit preserves the original ranking.
     """
     params = {"origin": o, "dest": d}
-    rows = _run_read(_TRANSIT_DIRECT_Q, params, timeout=8.0)
+    rows = _run_read(_TRANSIT_DIRECT_Q, params, timeout=8.0, session=session)
     if not rows:
-        rows = _run_read(_TRANSIT_TRANSFER_Q, params, timeout=12.0)
+        rows = _run_read(_TRANSIT_TRANSFER_Q, params, timeout=12.0, session=session)
     if not rows:
-        rows = _run_read(_TRANSIT_SHORTEST_Q, params, timeout=8.0)
+        rows = _run_read(_TRANSIT_SHORTEST_Q, params, timeout=8.0, session=session)
     if not rows:
         return None
     r = rows[0]
@@ -690,11 +702,20 @@ def find_transit_route(origin: str, destination: str) -> str:
     Returns:
         JSON with route segments, transfer points, total stops, and walking distances.
     """
-    origin_r = resolve_place(_run_read, origin)
+    # One session for the whole lookup (2 resolves + path + one direction
+    # probe per segment) instead of a fresh session per query.
+    with _driver.session(database=NEO4J_DATABASE) as session:
+        return _find_transit_route(origin, destination, session)
+
+
+def _find_transit_route(origin: str, destination: str, session) -> str:
+    run_read = functools.partial(_run_read, session=session)
+
+    origin_r = resolve_place(run_read, origin)
     if not origin_r or not (origin_r.get("nearest_stop") or {}).get("name"):
         return json.dumps({"error": f"Could not resolve origin '{origin}' to a transit stop."})
 
-    dest_r = resolve_place(_run_read, destination)
+    dest_r = resolve_place(run_read, destination)
     if not dest_r or not (dest_r.get("nearest_stop") or {}).get("name"):
         return json.dumps({"error": f"Could not resolve destination '{destination}' to a transit stop."})
 
@@ -708,7 +729,7 @@ def find_transit_route(origin: str, destination: str) -> str:
             "message": "Origin and destination resolve to the same stop.",
         })
 
-    best_path = _find_best_path(o, d)
+    best_path = _find_best_path(o, d, session=session)
 
     if best_path is None:
         return json.dumps({
@@ -733,7 +754,7 @@ def find_transit_route(origin: str, destination: str) -> str:
             seg_to = stop_names[i + 1]
 
             # Look up the terminal stop in the travel direction
-            direction = _get_line_direction(seg_line, stop_names[seg_start], seg_to)
+            direction = _get_line_direction(seg_line, stop_names[seg_start], seg_to, session=session)
 
             segments.append({
                 "line": seg_line,
@@ -764,4 +785,7 @@ def find_transit_route(origin: str, destination: str) -> str:
 # Entry point
 # ---------------------------------------------------------------------------
 if __name__ == "__main__":
+    # stdout carries the MCP stdio protocol, so log records (e.g. Neo4j
+    # traces from neo4j_tools) go to stderr.
+    logging.basicConfig(stream=sys.stderr, level=logging.INFO)
     mcp.run(transport="stdio")
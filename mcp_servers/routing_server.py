@@ -6,7 +6,9 @@ Wraps OpenRouteService (walking/cycling/driving). Traffic data now comes from
 the FIWARE sensor network (see the FIWARE tools), not this server.
 """
 
+import functools
 import json
+import logging
 import sys
 import os
 from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
@@ -23,7 +25,10 @@ from config import (
     FIWARE_BASE_URL, FIWARE_API_KEY,
     NEO4J_URI, NEO4J_USERNAME, NEO4J_PASSWORD, NEO4J_DATABASE,
 )
-from mcp_servers._traffic_helpers import normalize_street_name, summarize_traffic_entity, haversine_m
+from mcp_servers._traffic_helpers import (
+    CONGESTION_LEVELS, CONGESTION_RANK, parse_geo_point,
+    normalize_street_name, summarize_traffic_entity, haversine_many_m,
+)
 from mcp_servers._place_resolver import resolve_place
 from neo4j_tools import Neo4jTransitGraph
 from neo4j import Query
@@ -75,15 +80,32 @@ def _resolve_via_neo4j(place_name: str) -> dict | None:
     maps to ONE node across every tool instead of three disagreeing matches.
     """
     try:
-        hit = resolve_place(_run_read, place_name)
+        hit = _resolve_via_neo4j_cached((place_name or "").strip().lower())
     except Exception:
         # Resolution must never crash routing — fall back to ORS.
         return None
+    return dict(hit) if hit else None
+
+
+@functools.lru_cache(maxsize=256)
+def _resolve_via_neo4j_cached(key: str) -> dict | None:
+    """Memoised graph lookup behind _resolve_via_neo4j. The campus graph only
+    changes on re-ingestion, and the agent resolves the same handful of places
+    (Hauptbahnhof, mensa, Building NN...) over and over, often twice per turn
+    (resolve_place_to_coordinates, then get_routes_for_places). Exceptions
+    propagate and are NOT cached, so a transient Neo4j error is retried."""
+    hit = resolve_place(_run_read, key)
     if not hit or hit.get("lat") is None or hit.get("lon") is None:
         return None
     return {"name": hit.get("name"), "lat": hit["lat"], "lon": hit["lon"], "type": hit.get("type")}
 
 
+def _entity_latlon(e: dict):
+    """(lat, lon) of a FIWARE entity's `location` ("lat,lon" string or GeoJSON
+    point), or (None, None) when it carries no usable position."""
+    return parse_geo_point(e.get("location"))
+
+
 def _nearest_online_parking(lat: float, lon: float, radius_m: int = 800) -> dict:
     """Nearest live FIWARE parking garage to a destination.
 
@@ -102,35 +124,28 @@ def _nearest_online_parking(lat: float, lon: float, radius_m: int = 800) -> dict
         return {"found": False}
     if not isinstance(res, dict) or not res.get("success"):
         return {"found": False}
-    best = None
+    garages, lats, lons = [], [], []
     for e in res.get("entities", []):
         if not isinstance(e, dict) or str(e.get("status")) != "Online":
             continue
-        loc = e.get("location")
-        plat = plon = None
-        if isinstance(loc, str) and "," in loc:
-            try:
-                parts = loc.split(",")
-                plat, plon = float(parts[0]), float(parts[1])
-            except (ValueError, IndexError):
-                continue
-        elif isinstance(loc, dict):
-            coords = loc.get("coordinates")
-            if isinstance(coords, list) and len(coords) >= 2:
-                plat, plon = coords[1], coords[0]
-        if plat is None:
+        plat, plon = _entity_latlon(e)
+        if plat is None or plon is None:
             continue
-        d = haversine_m(lat, lon, plat, plon)
-        if best is None or d < best["distance_m"]:
-            best = {
-                "name": e.get("name") or str(e.get("id", "")).split(":", 1)[-1],
-                "free_spots": e.get("freeSpots"),
-                "total_spots": e.get("totalSpots"),
-                "distance_m": round(d),
-            }
-    if best:
-        return {"found": True, "within_radius": best["distance_m"] <= radius_m, **best}
-    return {"found": False}
+        garages.append(e)
+        lats.append(plat)
+        lons.append(plon)
+    if not garages:
+        return {"found": False}
+    dists = haversine_many_m(lat, lon, lats, lons)
+    i = int(dists.argmin())
+    e = garages[i]
+    best = {
+        "name": e.get("name") or str(e.get("id", "")).split(":", 1)[-1],
+        "free_spots": e.get("freeSpots"),
+        "total_spots": e.get("totalSpots"),
+        "distance_m": round(float(dists[i])),
+    }
+    return {"found": True, "within_radius": best["distance_m"] <= radius_m, **best}
 
 
 # Outdoor air-quality pollutants we surface (µg/m³). CO2-only indoor sensors are skipped.
@@ -152,39 +167,32 @@ def _nearest_air_quality(lat: float, lon: float, radius_m: int = 3000) -> dict:
         return {"found": False, "radius_m": radius_m}
     if not isinstance(res, dict) or not res.get("success"):
         return {"found": False, "radius_m": radius_m}
-    best = None
+    stations, lats, lons = [], [], []
     for e in res.get("entities", []):
         if not isinstance(e, dict):
             continue
-        loc = e.get("location")
-        plat = plon = None
-        if isinstance(loc, str) and "," in loc:
-            try:
-                parts = loc.split(",")
-                plat, plon = float(parts[0]), float(parts[1])
-            except (ValueError, IndexError):
-                continue
-        elif isinstance(loc, dict):
-            coords = loc.get("coordinates")
-            if isinstance(coords, list) and len(coords) >= 2:
-                plat, plon = coords[1], coords[0]
-        if plat is None:
-            continue
-        d = haversine_m(lat, lon, plat, plon)
-        if d > radius_m:
+        plat, plon = _entity_latlon(e)
+        if plat is None or plon is None:
             continue
         pollutants = {k: e.get(k) for k in _AQ_POLLUTANTS if e.get(k) not in (None, "", [], {})}
         if not pollutants:
             continue
-        if best is None or d < best["distance_m"]:
-            best = {
-                "station": e.get("name") or str(e.get("id", "")).split(":", 1)[-1],
-                "distance_m": round(d),
-                "pollutants": pollutants,
-            }
-    if best:
-        return {"found": True, **best}
-    return {"found": False, "radius_m": radius_m}
+        stations.append((e, pollutants))
+        lats.append(plat)
+        lons.append(plon)
+    if not stations:
+        return {"found": False, "radius_m": radius_m}
+    dists = haversine_many_m(lat, lon, lats, lons)
+    i = int(dists.argmin())
+    if dists[i] > radius_m:
+        return {"found": False, "radius_m": radius_m}
+    e, pollutants = stations[i]
+    return {
+        "found": True,
+        "station": e.get("name") or str(e.get("id", "")).split(":", 1)[-1],
+        "distance_m": round(float(dists[i])),
+        "pollutants": pollutants,
+    }
 
 
 def _route_traffic_summary(streets_on_route):
@@ -223,15 +231,14 @@ def _route_traffic_summary(streets_on_route):
                     matched[eid] = (part.strip(), summarize_traffic_entity(ent))
                 break
 
-    worst = "clear"
+    worst = 0
     slowdowns = []
     for _eid, (street, summ) in matched.items():
         cong = summ.get("congestion")
-        if cong == "heavy":
-            worst = "heavy"
-        elif cong == "moderate" and worst != "heavy":
-            worst = "moderate"
-        if cong in ("heavy", "moderate"):
+        rank = CONGESTION_RANK.get(cong, 0)
+        if rank > worst:
+            worst = rank
+        if rank:
             slowdowns.append({
                 "street": street,
                 "congestion": cong,
@@ -242,7 +249,7 @@ def _route_traffic_summary(streets_on_route):
     slowdowns.sort(key=lambda s: s["speed_ratio"] if s.get("speed_ratio") is not None else 9)
 
     return {
-        "congestion": worst,
+        "congestion": CONGESTION_LEVELS[worst],
         "basis": "live_speed" if matched else "no_slowdowns_reported",
         "method": "per_segment_name_join",
         "streets_checked": len(streets_on_route),
@@ -775,4 +782,7 @@ def get_routes_for_places(origin_name: str, destination_name: str) -> str:
 # Entry point
 # ---------------------------------------------------------------------------
 if __name__ == "__main__":
+    # stdout carries the MCP stdio protocol, so log records (e.g. Neo4j
+    # traces from neo4j_tools) go to stderr.
+    logging.basicConfig(stream=sys.stderr, level=logging.INFO)
     mcp.run(transport="stdio")
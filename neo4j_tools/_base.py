@@ -8,10 +8,50 @@ The driver is injected (shared singleton from mcp_servers/neo4j_server.py)
 rather than created per instance — see `neo4j_tools.get_default_driver()`.
 """
 
+import atexit
+import logging
+import re
+from math import asin, radians, sin, cos, sqrt, atan2
 from neo4j import GraphDatabase, Query
 from typing import Dict, List, Optional, Any
+
+import numpy as np
+
 from models import Coordinates
 
+# Optional: numba compiles the nearest-stop scan into one allocation-free
+# loop (distance + argmin in a single pass). Without it the numpy path is used.
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover - numba is an optional speed-up
+    njit = None
+
+logger = logging.getLogger(__name__)
+
+_EARTH_RADIUS_M = 6371000.0
+
+# Leading qualifiers dropped from building searches ("the mensa",
+# "building 3"); at most one is stripped, matched in a single anchored pass.
+_BUILDING_PREFIX_RE = re.compile(r"^(?:building|bldg|gebäude|magdeburg|ovgu|the) ")
+
+if njit is not None:
+    @njit(fastmath=True, cache=True)
+    def _nearest_index(lat1, lon1, lats, lons):
+        # Haversine is monotonic in `a`, so rank on `a` alone and pay the
+        # asin/sqrt only once for the winner.
+        best = -1
+        best_a = 1e30
+        cos_lat1 = cos(lat1)
+        for i in range(lats.shape[0]):
+            a = (sin((lats[i] - lat1) * 0.5) ** 2
+                 + cos_lat1 * cos(lats[i]) * sin((lons[i] - lon1) * 0.5) ** 2)
+            if a < best_a:
+                best_a = a
+                best = i
+        return best, 2.0 * _EARTH_RADIUS_M * asin(sqrt(best_a))
+else:
+    _nearest_index = None
+
 
 _DEFAULT_QUERY_TIMEOUT = 8.0
 
@@ -60,14 +100,19 @@ class Neo4jBase:
         self._stop_cache = None
         self._stop_embeddings = None
         self._fulltext_available = None  # None = not checked, True/False = checked
+        self._stop_point_index = None  # None = not checked, True/False = checked
         self._line_cache = None  # Cached set of line names from Neo4j
+        self._stop_coords = None  # (stops, lats_rad, lons_rad) for in-memory nearest-stop
+        self._stop_coords_available = None  # None = not loaded, True/False = loaded
+        self._use_numba = _nearest_index is not None  # cleared if the kernel fails to warm
         self.verbose = verbose
-        import atexit
         atexit.register(self.close)
 
-    def _log(self, message: str) -> None:
+    def _log(self, message: str, *args) -> None:
+        # %-style args: the message is only formatted when verbose, and it
+        # goes to stderr via logging (stdout is the MCP stdio channel).
         if self.verbose:
-            print(message)
+            logger.info(message, *args)
 
     def close(self):
         # Only close if we own the driver — a shared singleton must outlive us.
@@ -87,7 +132,7 @@ class Neo4jBase:
                 result = session.run(_q("RETURN 1 as test"))
                 return result.single()["test"] == 1
         except Exception as e:
-            print(f"Neo4j connection test failed: {e}")
+            logger.warning(f"Neo4j connection test failed: {e}")
             return False
 
     def _ensure_fulltext_indexes(self) -> bool:
@@ -116,17 +161,38 @@ class Neo4jBase:
                 states = {r["name"]: r["state"] for r in result}
                 if states:
                     self._fulltext_available = True
-                    self._log(f"[NEO4J] Full-text indexes: {states}")
+                    self._log("[NEO4J] Full-text indexes: %s", states)
                 else:
                     self._fulltext_available = False
                     self._log("[NEO4J] Full-text indexes not found after creation")
 
         except Exception as e:
-            self._log(f"[NEO4J] Full-text indexes not available: {e}")
+            self._log("[NEO4J] Full-text indexes not available: %s", e)
             self._fulltext_available = False
 
         return self._fulltext_available
 
+    def _has_stop_point_index(self, session) -> bool:
+        """Check once whether the `stop_location` point index is online, so
+        nearest-stop lookups can range-filter through it instead of computing
+        point.distance() over every Stop. Read-only: the Stop `location`
+        backfill and the index itself are created at ingestion time
+        (ingestion/loaders/restore_backup.py)."""
+        if self._stop_point_index is not None:
+            return self._stop_point_index
+        try:
+            record = session.run(_q(
+                "SHOW INDEXES YIELD name, state WHERE name = 'stop_location' RETURN state",
+                timeout=15.0,
+            )).single()
+            self._stop_point_index = record is not None and record["state"] == "ONLINE"
+            if not self._stop_point_index:
+                self._log("[NEO4J] Stop point index not online, using full scan")
+        except Exception as e:
+            self._log("[NEO4J] Stop point index not available: %s", e)
+            self._stop_point_index = False
+        return self._stop_point_index
+
     def _init_semantic_search(self):
         if self._building_cache is not None:
             return
@@ -135,7 +201,6 @@ class Neo4jBase:
             from sentence_transformers import SentenceTransformer
             self._encoder = SentenceTransformer('all-MiniLM-L6-v2')
         try:
-            import numpy as np
             self._log("   Building semantic search index for neo4j_tools...")
             with self.driver.session(database=self.database) as session:
                 result = session.run(_q("""
@@ -168,9 +233,9 @@ class Neo4jBase:
                     search_text = " | ".join(filter(None, text_parts))
                     building_texts.append(search_text)
                 self._building_embeddings = self._encoder.encode(building_texts, normalize_embeddings=True)
-                self._log(f"   Building cache ready: {len(self._building_cache)} buildings")
+                self._log("   Building cache ready: %s buildings", len(self._building_cache))
         except Exception as e:
-            self._log(f"   Semantic search init failed: {e}")
+            self._log("   Semantic search init failed: %s", e)
             self._encoder = None
             self._semantic_search_failed = True
 
@@ -179,14 +244,13 @@ class Neo4jBase:
         if self._encoder is None or getattr(self, '_semantic_search_failed', False):
             return None
         try:
-            import numpy as np
             query_embedding = self._encoder.encode(query, normalize_embeddings=True)
             similarities = np.dot(self._building_embeddings, query_embedding)
             best_idx = np.argmax(similarities)
             best_score = similarities[best_idx]
             if best_score >= threshold:
                 building = self._building_cache[best_idx]
-                self._log(f"   Semantic match: '{query}' -> {building['name']} (score: {best_score:.2f})")
+                self._log("   Semantic match: '%s' -> %s (score: %.2f)", query, building['name'], best_score)
                 return {
                     "id": building["id"],
                     "name": building["name"],
@@ -197,7 +261,7 @@ class Neo4jBase:
                 }
             return None
         except Exception as e:
-            self._log(f"   Semantic search error: {e}")
+            self._log("   Semantic search error: %s", e)
             return None
 
     def _init_semantic_stop_search(self):
@@ -206,7 +270,6 @@ class Neo4jBase:
         if self._encoder is None:
             return
         try:
-            import numpy as np
             self._log("   Building semantic stop search index...")
             with self.driver.session(database=self.database) as session:
                 result = session.run(_q("""
@@ -229,9 +292,9 @@ class Neo4jBase:
                     short_name = name.replace("Magdeburg ", "")
                     stop_texts.append(f"{name} | {short_name}")
                 self._stop_embeddings = self._encoder.encode(stop_texts, normalize_embeddings=True)
-                self._log(f"   Stop cache ready: {len(self._stop_cache)} stops")
+                self._log("   Stop cache ready: %s stops", len(self._stop_cache))
         except Exception as e:
-            self._log(f"   Semantic stop search init failed: {e}")
+            self._log("   Semantic stop search init failed: %s", e)
             self._stop_cache = None
             self._stop_embeddings = None
 
@@ -240,14 +303,13 @@ class Neo4jBase:
         if self._stop_cache is None or self._stop_embeddings is None:
             return None
         try:
-            import numpy as np
             query_embedding = self._encoder.encode(query, normalize_embeddings=True)
             similarities = np.dot(self._stop_embeddings, query_embedding)
             best_idx = np.argmax(similarities)
             best_score = similarities[best_idx]
             if best_score >= threshold:
                 stop = self._stop_cache[best_idx]
-                self._log(f"   Semantic stop match: '{query}' -> {stop['name']} (score: {best_score:.2f})")
+                self._log("   Semantic stop match: '%s' -> %s (score: %.2f)", query, stop['name'], best_score)
                 return {
                     "type": "Stop",
                     "name": stop["name"],
@@ -259,7 +321,7 @@ class Neo4jBase:
                 }
             return None
         except Exception as e:
-            self._log(f"   Semantic stop search error: {e}")
+            self._log("   Semantic stop search error: %s", e)
             return None
 
     def _normalize_stop_name(self, stop_name: str) -> str:
@@ -282,9 +344,9 @@ class Neo4jBase:
                 ))
                 record = result.single()
                 self._line_cache = set(record["lines"]) if record else set()
-                self._log(f"[NEO4J] Line cache loaded: {len(self._line_cache)} lines")
+                self._log("[NEO4J] Line cache loaded: %s lines", len(self._line_cache))
         except Exception as e:
-            self._log(f"[NEO4J] Line cache init failed: {e}")
+            self._log("[NEO4J] Line cache init failed: %s", e)
             self._line_cache = set()
 
     def _normalize_line_name(self, line_name: str) -> str:
@@ -302,9 +364,10 @@ class Neo4jBase:
             return line_name
 
         # Case-insensitive exact match
+        line_lower = line_name.lower()
         lower_map = {l.lower(): l for l in self._line_cache}
-        if line_name.lower() in lower_map:
-            return lower_map[line_name.lower()]
+        if line_lower in lower_map:
+            return lower_map[line_lower]
 
         # Strip generic prefixes to get the number/identifier
         number = line_name
@@ -320,22 +383,20 @@ class Neo4jBase:
                 return candidate
 
         # Case-insensitive suffix match (handles "9" matching "Tram 9")
+        suffix = f" {number.lower()}"
         for cached_line in self._line_cache:
-            if cached_line.lower().endswith(f" {number.lower()}"):
+            if cached_line.lower().endswith(suffix):
                 return cached_line
 
         # Nothing matched — return as-is and let the query fail gracefully
-        self._log(f"[NEO4J] ⚠️ Could not resolve line name '{line_name}' to any known line")
+        self._log("[NEO4J] ⚠️ Could not resolve line name '%s' to any known line", line_name)
         return line_name
 
     def _find_building_universal(self, search_input: str, session=None) -> Optional[Dict]:
-        self._log(f"[NEO4J] 🔍 _find_building_universal: searching for '{search_input}'")
+        self._log("[NEO4J] 🔍 _find_building_universal: searching for '%s'", search_input)
         search_term = search_input.strip().lower()
         original_search = search_term
-        for prefix in ["building ", "bldg ", "gebäude ", "magdeburg ", "ovgu ", "the "]:
-            if search_term.startswith(prefix):
-                search_term = search_term[len(prefix):]
-                break
+        search_term = _BUILDING_PREFIX_RE.sub("", search_term, count=1)
 
         # For numeric searches, create exact building name variants
         is_numeric_search = search_term.isdigit()
@@ -363,7 +424,7 @@ class Neo4jBase:
                 num_result = sess.run(_q(exact_num_query), variants=building_number_variants)
                 num_record = num_result.single()
                 if num_record:
-                    self._log(f"[NEO4J] ✅ Found via exact number match: {num_record['name']}")
+                    self._log("[NEO4J] ✅ Found via exact number match: %s", num_record['name'])
                     return {
                         "id": num_record["name"],
                         "name": num_record["name"],
@@ -372,7 +433,7 @@ class Neo4jBase:
                         "match_type": "exact"
                     }
                 # If no exact numeric match, fall through to semantic search
-                self._log(f"[NEO4J] No exact numeric match for '{search_term}', trying semantic...")
+                self._log("[NEO4J] No exact numeric match for '%s', trying semantic...", search_term)
             else:
                 # For non-numeric searches, first try exact name match
                 exact_query = """
@@ -384,7 +445,7 @@ class Neo4jBase:
                 exact_result = sess.run(_q(exact_query), search_term=search_term)
                 exact_record = exact_result.single()
                 if exact_record:
-                    self._log(f"[NEO4J] ✅ Found via exact name match: {exact_record['name']}")
+                    self._log("[NEO4J] ✅ Found via exact name match: %s", exact_record['name'])
                     return {
                         "id": exact_record["name"],
                         "name": exact_record["name"],
@@ -405,7 +466,7 @@ class Neo4jBase:
                 word_result = sess.run(_q(word_query), search_term=search_term)
                 word_record = word_result.single()
                 if word_record:
-                    self._log(f"[NEO4J] ✅ Found via contains match: {word_record['name']}")
+                    self._log("[NEO4J] ✅ Found via contains match: %s", word_record['name'])
                     return {
                         "id": word_record["name"],
                         "name": word_record["name"],
@@ -424,7 +485,7 @@ class Neo4jBase:
             alias_result = sess.run(_q(alias_query), search_term=search_term)
             alias_record = alias_result.single()
             if alias_record:
-                self._log(f"[NEO4J] ✅ Found via alias match: {alias_record['name']}")
+                self._log("[NEO4J] ✅ Found via alias match: %s", alias_record['name'])
                 return {
                     "id": alias_record["name"],
                     "name": alias_record["name"],
@@ -443,7 +504,7 @@ class Neo4jBase:
             text_result = sess.run(_q(text_query), search_term=search_term)
             text_record = text_result.single()
             if text_record:
-                self._log(f"[NEO4J] ✅ Found via property search: {text_record['name']}")
+                self._log("[NEO4J] ✅ Found via property search: %s", text_record['name'])
                 return {
                     "id": text_record["name"],
                     "name": text_record["name"],
@@ -451,7 +512,7 @@ class Neo4jBase:
                     "longitude": text_record["longitude"],
                     "match_type": "property"
                 }
-            self._log(f"[NEO4J] No exact match, trying semantic search for '{search_term}'...")
+            self._log("[NEO4J] No exact match, trying semantic search for '%s'...", search_term)
             semantic_result = self._semantic_building_search(search_term)
             if semantic_result:
                 return semantic_result
@@ -498,7 +559,7 @@ class Neo4jBase:
         }
 
     def _find_stop_or_building(self, location_name: str, session) -> Optional[Dict]:
-        self._log(f"[NEO4J]   _find_stop_or_building: '{location_name}'")
+        self._log("[NEO4J]   _find_stop_or_building: '%s'", location_name)
         search_term = location_name.strip().lower()
 
         # Clean up stop-related suffixes for better matching
@@ -538,7 +599,7 @@ class Neo4jBase:
                            stop_core=stop_search_no_prefix)
         record = result.single()
         if record:
-            self._log(f"[NEO4J]   ✅ Found as Stop: {record['name']}")
+            self._log("[NEO4J]   ✅ Found as Stop: %s", record['name'])
             return {
                 "type": "Stop",
                 "name": record["name"],
@@ -548,18 +609,18 @@ class Neo4jBase:
             }
 
         # 1b. Semantic stop search (handles compound words like "Altermarkt" -> "Alter Markt")
-        self._log(f"[NEO4J]   Trying semantic stop search...")
+        self._log("[NEO4J]   Trying semantic stop search...")
         semantic_stop = self._semantic_stop_search(location_name)
         if semantic_stop:
-            self._log(f"[NEO4J]   ✅ Found as Stop (semantic): {semantic_stop['name']}")
+            self._log("[NEO4J]   ✅ Found as Stop (semantic): %s", semantic_stop['name'])
             return semantic_stop
 
         # 2. Check Buildings FIRST (campus buildings take priority over POIs)
         # This ensures "mensa" matches campus Mensa (Building 27) not "Mensa Herrenkrug" POI
-        self._log(f"[NEO4J]   Not a stop, checking buildings...")
+        self._log("[NEO4J]   Not a stop, checking buildings...")
         building = self._find_building_universal(location_name, session)
         if building:
-            self._log(f"[NEO4J]   ✅ Found as Building: {building['name']}")
+            self._log("[NEO4J]   ✅ Found as Building: %s", building['name'])
             return {
                 "type": "Building",
                 "name": building["name"],
@@ -568,7 +629,7 @@ class Neo4jBase:
             }
 
         # 3. Check POIs - only if no building found (for restaurants, cafes, etc.)
-        self._log(f"[NEO4J]   Not a building, checking POIs...")
+        self._log("[NEO4J]   Not a building, checking POIs...")
         poi_query = """
             MATCH (p:POI)
             WHERE toLower(p.name) = $exact_search
@@ -581,7 +642,7 @@ class Neo4jBase:
         result = session.run(_q(poi_query), exact_search=search_term, search=search_term)
         record = result.single()
         if record:
-            self._log(f"[NEO4J]   ✅ Found as POI: {record['name']} ({record['category']})")
+            self._log("[NEO4J]   ✅ Found as POI: %s (%s)", record['name'], record['category'])
             return {
                 "type": "POI",
                 "name": record["name"],
@@ -592,7 +653,7 @@ class Neo4jBase:
             }
 
         # 4. Fallback to find_any_location (fuzzy + word-by-word matching)
-        self._log(f"[NEO4J]   Trying fuzzy fallback for: {location_name}")
+        self._log("[NEO4J]   Trying fuzzy fallback for: %s", location_name)
         fallback = self.find_any_location(location_name, limit=1)
         if fallback.get("success") and fallback.get("results"):
             loc = fallback["results"][0]
@@ -601,7 +662,7 @@ class Neo4jBase:
             lon = coords.get("longitude") or loc.get("longitude")
             if lat and lon:
                 loc_type = loc.get("type", "Building")
-                self._log(f"[NEO4J]   ✅ Found via fuzzy fallback: {loc['name']} ({loc_type})")
+                self._log("[NEO4J]   ✅ Found via fuzzy fallback: %s (%s)", loc['name'], loc_type)
                 return {
                     "type": loc_type,
                     "name": loc["name"],
@@ -609,12 +670,11 @@ class Neo4jBase:
                     "longitude": lon
                 }
 
-        self._log(f"[NEO4J]   ❌ Location not found: {location_name}")
+        self._log("[NEO4J]   ❌ Location not found: %s", location_name)
         return None
 
     def calculate_distance(self, point1: Coordinates, point2: Coordinates) -> int:
         """Haversine distance in meters between two Coordinates."""
-        from math import radians, sin, cos, sqrt, atan2
         R = 6371000
         lat1_rad = radians(point1.lat)
         lat2_rad = radians(point2.lat)
@@ -630,27 +690,125 @@ class Neo4jBase:
         """Find the nearest transit stop to the given coordinates.
         Returns dict with name, lines, latitude, longitude, distance_meters or None.
         """
+        nearest = self._nearest_stop_in_memory(coords)
+        if nearest is not None:
+            return nearest
         with self.driver.session(database=self.database) as session:
             return self._find_nearest_stop(session, coords)
 
+    def warm_stop_coords(self) -> bool:
+        """Load the in-memory stop coordinate arrays ahead of the first
+        nearest-stop lookup (called from API startup). Returns True if the
+        in-memory lookup is available."""
+        self._init_stop_coords()
+        return bool(self._stop_coords_available)
+
+    def _init_stop_coords(self):
+        """Load every Stop's coordinates ONCE into parallel numpy arrays
+        (structure-of-arrays, radians pre-applied) so nearest-stop lookups are
+        a handful of vectorised ops with no Neo4j round trip. Stops only
+        change on re-ingestion, like the line cache. A failed or empty load
+        is remembered too, so lookups fall back to Cypher without re-scanning."""
+        if self._stop_coords_available is not None:
+            return
+        try:
+            with self.driver.session(database=self.database) as session:
+                result = session.run(_q("""
+                    MATCH (s:Stop)
+                    WHERE s.latitude IS NOT NULL AND s.longitude IS NOT NULL
+                    RETURN s.name as name, COALESCE(s.lines, []) as lines,
+                           s.latitude as latitude, s.longitude as longitude
+                """, timeout=15.0))
+                stops = [dict(record) for record in result]
+            if not stops:
+                self._log("[NEO4J] No stops with coordinates, in-memory lookup disabled")
+                self._stop_coords_available = False
+                return
+            lats = np.radians(np.array([st["latitude"] for st in stops], dtype=np.float64))
+            lons = np.radians(np.array([st["longitude"] for st in stops], dtype=np.float64))
+            self._stop_coords = (stops, lats, lons)
+            self._stop_coords_available = True
+            self._log("[NEO4J] Stop coordinate arrays ready: %s stops", len(stops))
+        except Exception as e:
+            self._log("[NEO4J] Stop coordinate arrays unavailable: %s", e)
+            self._stop_coords_available = False
+            return
+        # Compile (or load from numba's on-disk cache) the kernel now, in
+        # the startup warm-up thread, so the first nearest-stop request
+        # doesn't pay for JIT compilation. If it won't compile, lookups use
+        # the numpy argmin instead.
+        if self._use_numba:
+            try:
+                _nearest_index(lats[0], lons[0], lats, lons)
+            except Exception as e:
+                self._log("[NEO4J] numba nearest-stop kernel unavailable, using numpy: %s", e)
+                self._use_numba = False
+
+    def _nearest_stop_in_memory(self, coords: Coordinates) -> Optional[Dict]:
+        self._init_stop_coords()
+        if not self._stop_coords_available:
+            return None
+        stops, lats, lons = self._stop_coords
+        lat1, lon1 = radians(coords.lat), radians(coords.lon)
+        if self._use_numba:
+            i, dist = _nearest_index(lat1, lon1, lats, lons)
+        else:
+            a = np.sin((lats - lat1) / 2) ** 2 + cos(lat1) * np.cos(lats) * np.sin((lons - lon1) / 2) ** 2
+            i = int(a.argmin())
+            dist = 2 * _EARTH_RADIUS_M * asin(sqrt(a[i]))
+        stop = stops[i]
+        return {
+            "name": stop["name"],
+            "lines": stop["lines"] or [],
+            "latitude": stop["latitude"],
+            "longitude": stop["longitude"],
+            "distance_meters": float(round(dist)),
+        }
+
+    # Index-backed: the distance predicate lets the planner seek the
+    # stop_location point index, so only stops inside the radius are ranked.
+    _NEAREST_STOP_INDEXED_Q = """
+        WITH point({latitude: $lat, longitude: $lon}) AS here
+        MATCH (s:Stop)
+        WHERE point.distance(s.location, here) <= $max_m
+        WITH s, point.distance(s.location, here) AS distance
+        ORDER BY distance
+        LIMIT 1
+        RETURN s.name as name, s.lines as lines, s.latitude as latitude, s.longitude as longitude,
+               round(distance) as distance_meters
+    """
+
+    _NEAREST_STOP_SCAN_Q = """
+        MATCH (s:Stop)
+        WITH s, point.distance(
+            point({latitude: $lat, longitude: $lon}),
+            point({latitude: s.latitude, longitude: s.longitude})
+        ) as distance
+        ORDER BY distance
+        LIMIT 1
+        RETURN s.name as name, s.lines as lines, s.latitude as latitude, s.longitude as longitude,
+               round(distance) as distance_meters
+    """
+
+    _NEAREST_STOP_RADIUS_M = 5000
+
     def _find_nearest_stop(self, session, coords: Coordinates) -> Optional[Dict]:
-        self._log(f"[NEO4J]     _find_nearest_stop: lat={coords.lat}, lon={coords.lon}")
-        query = """
-            MATCH (s:Stop)
-            WITH s, point.distance(
-                point({latitude: $lat, longitude: $lon}),
-                point({latitude: s.latitude, longitude: s.longitude})
-            ) as distance
-            ORDER BY distance
-            LIMIT 1
-            RETURN s.name as name, s.lines as lines, s.latitude as latitude, s.longitude as longitude,
-                   round(distance) as distance_meters
-        """
+        self._log("[NEO4J]     _find_nearest_stop: lat=%s, lon=%s", coords.lat, coords.lon)
         try:
-            result = session.run(_q(query), lat=coords.lat, lon=coords.lon)
-            record = result.single()
+            record = None
+            if self._has_stop_point_index(session):
+                record = session.run(
+                    _q(self._NEAREST_STOP_INDEXED_Q), lat=coords.lat, lon=coords.lon,
+                    max_m=self._NEAREST_STOP_RADIUS_M,
+                ).single()
+            if record is None:
+                # No index, or no stop within the radius (user far outside the
+                # city) — the full scan still returns the true nearest stop.
+                record = session.run(
+                    _q(self._NEAREST_STOP_SCAN_Q), lat=coords.lat, lon=coords.lon,
+                ).single()
             if record:
-                self._log(f"[NEO4J]     ✅ Nearest stop: {record['name']} ({record['distance_meters']}m)")
+                self._log("[NEO4J]     ✅ Nearest stop: %s (%sm)", record['name'], record['distance_meters'])
                 return {
                     "name": record["name"],
                     "lines": record["lines"] or [],
@@ -658,7 +816,7 @@ class Neo4jBase:
                     "longitude": record["longitude"],
                     "distance_meters": record["distance_meters"]
                 }
-            self._log(f"[NEO4J]     ❌ No stops found")
+            self._log("[NEO4J]     ❌ No stops found")
         except Exception as e:
-            self._log(f"[NEO4J]     ⚠️ Error finding nearest stop: {e}")
+            self._log("[NEO4J]     ⚠️ Error finding nearest stop: %s", e)
         return None
@@ -1,5 +1,7 @@
 """Search and location lookup mixin for Neo4j transit graph."""
 
+import functools
+import re
 from typing import Dict, List, Optional
 from models import Coordinates
 
@@ -19,11 +21,41 @@ _VALID_PLACE_TYPES = frozenset({
     "hotel", "hostel",
 })
 
+# Stop words dropped before building search terms. Module-level frozensets so
+# each query is tokenised once and filtered by hash lookups, instead of
+# rebuilding the set literal on every call.
+_BOOST_STOP_WORDS = frozenset({
+    'the', 'a', 'an', 'of', 'and', 'or', 'in', 'at', 'to', 'for',
+    'is', 'are', 'where', 'what', 'how', 'near',
+})
+_FALLBACK_STOP_WORDS = _BOOST_STOP_WORDS - {'near'}
+# Lucene specials escaped before a term goes into a full-text query, as one
+# precompiled character class (a single sub() per term).
+_LUCENE_SPECIAL_RE = re.compile("([" + re.escape('+-&|!(){}[]^"~*?:\\/') + "])")
+
+_LUCENE_STOP_WORDS = _BOOST_STOP_WORDS | {
+    'which', 'who',
+    'der', 'die', 'das', 'ein', 'eine', 'und', 'oder', 'am', 'im',
+    'von', 'zu', 'für', 'ist', 'sind', 'wo', 'was', 'wie',
+}
+
+# ON_STREET lookup per node label, keyed by the location's `type`, so the
+# per-location dispatch is one dict lookup instead of an if/elif chain.
+_STREET_QUERY_BY_TYPE = {
+    label: f"""
+        MATCH (n:{label} {{name: $name}})-[r:ON_STREET]->(s:Street)
+        RETURN s.name as street_name, r.distance_m as distance
+        ORDER BY r.distance_m
+        LIMIT 3
+    """
+    for label in ("Building", "Stop", "POI")
+}
+
 
 class SearchMixin:
 
     def get_building_info(self, building_id: str) -> Dict:
-        self._log(f"[NEO4J] get_building_info called with: '{building_id}'")
+        self._log("[NEO4J] get_building_info called with: '%s'", building_id)
         with self.driver.session(database=self.database) as session:
             found_building = self._find_building_universal(building_id, session)
             if not found_building:
@@ -34,21 +66,21 @@ class SearchMixin:
                     "suggestion": "Try describing what you're looking for or use building numbers 01-30"
                 }
             match_type = found_building.get('match_type', 'exact')
-            self._log(f"[NEO4J] ✅ Found: {found_building['name']} [match: {match_type}]")
+            self._log("[NEO4J] ✅ Found: %s [match: %s]", found_building['name'], match_type)
             result = self._get_building_by_exact_id(session, found_building["id"])
             if result.get("success") and result.get("building"):
                 result["building"]["match_type"] = match_type
             return result
 
     def find_building_by_function(self, query: str, limit: int = 10) -> Dict:
-        self._log(f"[NEO4J] find_building_by_function called with: '{query}'")
+        self._log("[NEO4J] find_building_by_function called with: '%s'", query)
         with self.driver.session(database=self.database) as session:
             buildings = []
 
             # Primary path: full-text search
             if self._ensure_fulltext_indexes():
                 lucene_query = self._build_lucene_query(query)
-                self._log(f"[NEO4J] FTS query: '{lucene_query}'")
+                self._log("[NEO4J] FTS query: '%s'", lucene_query)
                 result = session.run("""
                     CALL db.index.fulltext.queryNodes("building_fts", $fts_query) YIELD node, score
                     RETURN node.name as name, node.function as function,
@@ -212,7 +244,7 @@ class SearchMixin:
                     if stops:
                         loc["nearest_stops"] = stops
             except Exception as e:
-                self._log(f"[NEO4J] enrich Building bulk failed: {e}")
+                self._log("[NEO4J] enrich Building bulk failed: %s", e)
 
         # --- Stops: just streets ---
         if by_type["Stop"]:
@@ -234,7 +266,7 @@ class SearchMixin:
                         loc["streets"] = streets
                         loc["street"] = streets[0]["name"]
             except Exception as e:
-                self._log(f"[NEO4J] enrich Stop bulk failed: {e}")
+                self._log("[NEO4J] enrich Stop bulk failed: %s", e)
 
         # --- POIs: details + streets ---
         if by_type["POI"]:
@@ -272,7 +304,7 @@ class SearchMixin:
                         loc["streets"] = streets
                         loc["street"] = streets[0]["name"]
             except Exception as e:
-                self._log(f"[NEO4J] enrich POI bulk failed: {e}")
+                self._log("[NEO4J] enrich POI bulk failed: %s", e)
 
         return locations
 
@@ -285,29 +317,8 @@ class SearchMixin:
             if not loc_name:
                 continue
 
-            # Query ON_STREET relationship based on node type
-            if loc_type == "Building":
-                query = """
-                    MATCH (b:Building {name: $name})-[r:ON_STREET]->(s:Street)
-                    RETURN s.name as street_name, r.distance_m as distance
-                    ORDER BY r.distance_m
-                    LIMIT 3
-                """
-            elif loc_type == "Stop":
-                query = """
-                    MATCH (st:Stop {name: $name})-[r:ON_STREET]->(s:Street)
-                    RETURN s.name as street_name, r.distance_m as distance
-                    ORDER BY r.distance_m
-                    LIMIT 3
-                """
-            elif loc_type == "POI":
-                query = """
-                    MATCH (p:POI {name: $name})-[r:ON_STREET]->(s:Street)
-                    RETURN s.name as street_name, r.distance_m as distance
-                    ORDER BY r.distance_m
-                    LIMIT 3
-                """
-            else:
+            query = _STREET_QUERY_BY_TYPE.get(loc_type)
+            if query is None:
                 continue
 
             try:
@@ -323,7 +334,7 @@ class SearchMixin:
                     loc["streets"] = streets
                     loc["street"] = streets[0]["name"]
             except Exception as e:
-                self._log(f"[NEO4J] ⚠️ Error getting street for {loc_name}: {e}")
+                self._log("[NEO4J] ⚠️ Error getting street for %s: %s", loc_name, e)
 
         return locations
 
@@ -353,9 +364,9 @@ class SearchMixin:
                         loc["sensors"] = detail["sensors"]
                     if detail.get("nearest_stops"):
                         loc["nearest_stops"] = detail["nearest_stops"]
-                    self._log(f"[NEO4J]   Enriched building: {building_name}")
+                    self._log("[NEO4J]   Enriched building: %s", building_name)
             except Exception as e:
-                self._log(f"[NEO4J] ⚠️ Error enriching building {building_name}: {e}")
+                self._log("[NEO4J] ⚠️ Error enriching building %s: %s", building_name, e)
         return locations
 
     def _enrich_pois_with_details(self, session, locations: List[Dict]) -> List[Dict]:
@@ -390,42 +401,32 @@ class SearchMixin:
                         loc["phone"] = record["phone"]
                     if record["website"]:
                         loc["website"] = record["website"]
-                    self._log(f"[NEO4J]   Enriched POI: {poi_name}")
+                    self._log("[NEO4J]   Enriched POI: %s", poi_name)
             except Exception as e:
-                self._log(f"[NEO4J] ⚠️ Error enriching POI {poi_name}: {e}")
+                self._log("[NEO4J] ⚠️ Error enriching POI %s: %s", poi_name, e)
         return locations
 
     # --- Full-text search (Lucene) ---
 
-    _LUCENE_SPECIAL = set('+-&|!(){}[]^"~*?:\\/')
-
     @staticmethod
     def _escape_lucene(term: str) -> str:
         """Escape Lucene special characters in a search term."""
-        out = []
-        for ch in term:
-            if ch in SearchMixin._LUCENE_SPECIAL:
-                out.append('\\')
-            out.append(ch)
-        return ''.join(out)
+        return _LUCENE_SPECIAL_RE.sub(r"\\\1", term)
 
     @staticmethod
+    @functools.lru_cache(maxsize=1024)
     def _build_lucene_query(search_term: str) -> str:
         """Build a Lucene query string from user input.
 
         - Strips stop words (EN + DE)
         - Words >= 4 chars: word~1 (fuzzy) + word^2 (exact boost)
         - Words < 4 chars: exact only (fuzzy on short words = too many false positives)
-        """
-        stop_words = {
-            'the', 'a', 'an', 'of', 'and', 'or', 'in', 'at', 'to', 'for',
-            'is', 'are', 'where', 'what', 'how', 'which', 'who', 'near',
-            'der', 'die', 'das', 'ein', 'eine', 'und', 'oder', 'am', 'im',
-            'von', 'zu', 'für', 'ist', 'sind', 'wo', 'was', 'wie',
-        }
 
+        Pure function of the input, so repeated place names (common across
+        sessions) are memoised.
+        """
         raw_words = search_term.strip().lower().split()
-        words = [w for w in raw_words if w not in stop_words and len(w) > 1]
+        words = [w for w in raw_words if w not in _LUCENE_STOP_WORDS and len(w) > 1]
 
         if not words:
             words = [w for w in raw_words if len(w) > 1]
@@ -459,54 +460,55 @@ class SearchMixin:
             "score": record.get("score", 0)
         }
 
+    # Per-index full-text queries, built once at class definition rather than
+    # re-allocated on every search.
+    _FTS_QUERIES = (
+        ("building_fts", """
+            CALL db.index.fulltext.queryNodes("building_fts", $fts_query) YIELD node, score
+            RETURN 'Building' as node_type, node.name as id, node.name as name,
+                   node.function as description, null as subtype, node.address as address,
+                   node.latitude as lat, node.longitude as lon, score
+            LIMIT $limit
+        """),
+        ("stop_fts", """
+            CALL db.index.fulltext.queryNodes("stop_fts", $fts_query) YIELD node, score
+            RETURN 'Stop' as node_type, node.id as id, node.name as name,
+                   'Transit stop' as description, node.type as subtype, null as address,
+                   node.latitude as lat, node.longitude as lon, score
+            LIMIT $limit
+        """),
+        ("poi_fts", """
+            CALL db.index.fulltext.queryNodes("poi_fts", $fts_query) YIELD node, score
+            RETURN 'POI' as node_type, node.fiware_id as id, node.name as name,
+                   node.type as description, node.cuisine as subtype, node.address as address,
+                   node.latitude as lat, node.longitude as lon, score
+            LIMIT $limit
+        """),
+        ("landmark_fts", """
+            CALL db.index.fulltext.queryNodes("landmark_fts", $fts_query) YIELD node, score
+            RETURN 'Landmark' as node_type, node.id as id, node.name as name,
+                   node.description as description, null as subtype, null as address,
+                   node.latitude as lat, node.longitude as lon, score
+            LIMIT $limit
+        """),
+    )
+
     def _search_fulltext(self, session, search_term: str, limit: int) -> List[Dict]:
         """Search all node types using full-text indexes. Returns unified location list."""
         lucene_query = self._build_lucene_query(search_term)
-        self._log(f"[NEO4J] FTS Lucene query: '{lucene_query}'")
+        self._log("[NEO4J] FTS Lucene query: '%s'", lucene_query)
 
         locations = []
-
-        queries = [
-            ("building_fts", """
-                CALL db.index.fulltext.queryNodes("building_fts", $fts_query) YIELD node, score
-                RETURN 'Building' as node_type, node.name as id, node.name as name,
-                       node.function as description, null as subtype, node.address as address,
-                       node.latitude as lat, node.longitude as lon, score
-                LIMIT $limit
-            """),
-            ("stop_fts", """
-                CALL db.index.fulltext.queryNodes("stop_fts", $fts_query) YIELD node, score
-                RETURN 'Stop' as node_type, node.id as id, node.name as name,
-                       'Transit stop' as description, node.type as subtype, null as address,
-                       node.latitude as lat, node.longitude as lon, score
-                LIMIT $limit
-            """),
-            ("poi_fts", """
-                CALL db.index.fulltext.queryNodes("poi_fts", $fts_query) YIELD node, score
-                RETURN 'POI' as node_type, node.fiware_id as id, node.name as name,
-                       node.type as description, node.cuisine as subtype, node.address as address,
-                       node.latitude as lat, node.longitude as lon, score
-                LIMIT $limit
-            """),
-            ("landmark_fts", """
-                CALL db.index.fulltext.queryNodes("landmark_fts", $fts_query) YIELD node, score
-                RETURN 'Landmark' as node_type, node.id as id, node.name as name,
-                       node.description as description, null as subtype, null as address,
-                       node.latitude as lat, node.longitude as lon, score
-                LIMIT $limit
-            """),
-        ]
-
-        for index_name, cypher in queries:
+        for index_name, cypher in self._FTS_QUERIES:
             try:
                 result = session.run(cypher, fts_query=lucene_query, limit=limit)
                 for record in result:
                     locations.append(self._record_to_location(record))
             except Exception as e:
-                self._log(f"[NEO4J] {index_name} query error: {e}")
+                self._log("[NEO4J] %s query error: %s", index_name, e)
 
         locations.sort(key=lambda x: x.get("score", 0), reverse=True)
-        self._log(f"[NEO4J] FTS returned {len(locations)} total results")
+        self._log("[NEO4J] FTS returned %s total results", len(locations))
         return locations
 
     # --- Legacy CONTAINS-based search (fallback) ---
@@ -696,29 +698,16 @@ class SearchMixin:
         which *field* a match came from (name vs note). This method compensates
         by boosting name matches and penalizing common words.
         """
-        stop_words = {'the', 'a', 'an', 'of', 'and', 'or', 'in', 'at', 'to', 'for', 'is', 'are', 'where', 'what', 'how', 'near'}
         search_lower = search_term.strip().lower()
-        words = [w for w in search_lower.split() if w not in stop_words and len(w) > 2]
+        words = [w for w in search_lower.split() if w not in _BOOST_STOP_WORDS and len(w) > 2]
 
         if not words or not locations:
             return locations
 
-        # Count how many results contain each query word (for specificity)
-        word_freq = {}
-        for w in words:
-            count = 0
-            for loc in locations:
-                text = " ".join([
-                    (loc.get("name") or "").lower(),
-                    (loc.get("description") or "").lower(),
-                    (loc.get("note") or "").lower(),
-                    " ".join(loc.get("aliases") or []).lower(),
-                    (loc.get("subtype") or "").lower(),
-                ])
-                if w in text:
-                    count += 1
-            word_freq[w] = count
-
+        # Lower-case each result's searchable text ONCE; both passes below
+        # (word frequency, then scoring) reuse it instead of re-lowering every
+        # field for every query word.
+        texts = []
         for loc in locations:
             name_lower = (loc.get("name") or "").lower()
             all_text = " ".join([
@@ -728,20 +717,29 @@ class SearchMixin:
                 " ".join(loc.get("aliases") or []).lower(),
                 (loc.get("subtype") or "").lower(),
             ])
+            texts.append((name_lower, all_text))
 
+        # Count how many results contain each query word (for specificity).
+        # Only the <=1 / <=3 / more buckets matter, so stop counting a word
+        # once it is known to be common. The resulting bonus depends only on
+        # the word, so it is resolved here once rather than per result.
+        word_bonus = []
+        for w in words:
+            freq = 0
+            for _, text in texts:
+                if w in text:
+                    freq += 1
+                    if freq > 3:
+                        break
+            # Specificity: rare words get much bigger bonus
+            word_bonus.append((w, 10.0 if freq <= 1 else 3.0 if freq <= 3 else 0.5))
+
+        for loc, (name_lower, all_text) in zip(locations, texts):
             bonus = 0.0
-            for w in words:
+            for w, specificity in word_bonus:
                 if w not in all_text:
                     continue
-
-                # Specificity: rare words get much bigger bonus
-                freq = word_freq.get(w, 0)
-                if freq <= 1:
-                    bonus += 10.0
-                elif freq <= 3:
-                    bonus += 3.0
-                else:
-                    bonus += 0.5
+                bonus += specificity
 
                 # Field priority: name matches get extra boost
                 if w in name_lower:
@@ -759,30 +757,29 @@ class SearchMixin:
     def _search_locations_fallback(self, session, search_term: str, limit: int) -> List[Dict]:
         """Fallback search using CONTAINS when full-text indexes are unavailable."""
         search_lower = search_term.strip().lower()
-        stop_words = {'the', 'a', 'an', 'of', 'and', 'or', 'in', 'at', 'to', 'for', 'is', 'are', 'where', 'what', 'how'}
-        words = [w for w in search_lower.split() if w not in stop_words and len(w) > 2]
+        words = [w for w in search_lower.split() if w not in _FALLBACK_STOP_WORDS and len(w) > 2]
 
-        self._log(f"[NEO4J] Fallback: Strategy 1 - Exact phrase match...")
+        self._log("[NEO4J] Fallback: Strategy 1 - Exact phrase match...")
         locations = self._search_locations_exact(session, search_lower, search_term, limit)
         if locations:
-            self._log(f"[NEO4J] Fallback: Found {len(locations)} via exact match")
+            self._log("[NEO4J] Fallback: Found %s via exact match", len(locations))
             return locations
 
         if words:
-            self._log(f"[NEO4J] Fallback: Strategy 2 - Word-by-word with words: {words}")
+            self._log("[NEO4J] Fallback: Strategy 2 - Word-by-word with words: %s", words)
             locations = self._search_locations_by_words(session, words, limit)
             if locations:
-                self._log(f"[NEO4J] Fallback: Found {len(locations)} via word matching")
+                self._log("[NEO4J] Fallback: Found %s via word matching", len(locations))
                 return locations
 
         if words:
-            self._log(f"[NEO4J] Fallback: Strategy 3 - Single keyword '{words[0]}'")
+            self._log("[NEO4J] Fallback: Strategy 3 - Single keyword '%s'", words[0])
             locations = self._search_locations_single_keyword(session, words[0], limit)
 
         return locations
 
     def find_any_location(self, search_term: str, limit: int = 5) -> Dict:
-        self._log(f"[NEO4J] find_any_location called with: '{search_term}'")
+        self._log("[NEO4J] find_any_location called with: '%s'", search_term)
         fetch_limit = max(limit, 10)
 
         try:
@@ -791,16 +788,16 @@ class SearchMixin:
 
                 # Primary path: full-text search (BM25 scoring + fuzzy matching)
                 if self._ensure_fulltext_indexes():
-                    self._log(f"[NEO4J] Using full-text search")
+                    self._log("[NEO4J] Using full-text search")
                     locations = self._search_fulltext(session, search_term, fetch_limit)
 
                 # Fallback: old CONTAINS-based search
                 if not locations:
-                    self._log(f"[NEO4J] Falling back to CONTAINS search")
+                    self._log("[NEO4J] Falling back to CONTAINS search")
                     locations = self._search_locations_fallback(session, search_term, fetch_limit)
 
                 if not locations:
-                    self._log(f"[NEO4J] No locations found for: '{search_term}'")
+                    self._log("[NEO4J] No locations found for: '%s'", search_term)
                     return {
                         "success": False,
                         "error": f"No locations found matching '{search_term}'",
@@ -815,14 +812,14 @@ class SearchMixin:
                 locations = self._boost_name_matches(locations, search_term)
 
                 locations = locations[:limit]
-                self._log(f"[NEO4J] Found {len(locations)} location(s)")
+                self._log("[NEO4J] Found %s location(s)", len(locations))
                 return {"success": True, "query": search_term, "count": len(locations), "results": locations}
         except Exception as e:
-            self._log(f"[NEO4J] Error in find_any_location: {str(e)}")
+            self._log("[NEO4J] Error in find_any_location: %s", str(e))
             return {"success": False, "error": str(e)}
 
     def get_nearby_buildings(self, building_id: str, limit: int = 5) -> Dict:
-        self._log(f"[NEO4J] get_nearby_buildings called with: '{building_id}'")
+        self._log("[NEO4J] get_nearby_buildings called with: '%s'", building_id)
         with self.driver.session(database=self.database) as session:
             found = self._find_building_universal(building_id, session)
             if not found:
@@ -850,7 +847,7 @@ class SearchMixin:
             }
 
     def get_landmark_info(self, landmark_name: str) -> Dict:
-        self._log(f"[NEO4J] get_landmark_info called with: '{landmark_name}'")
+        self._log("[NEO4J] get_landmark_info called with: '%s'", landmark_name)
         search_term = landmark_name.strip().lower()
         with self.driver.session(database=self.database) as session:
             query = """
@@ -878,7 +875,7 @@ class SearchMixin:
     def find_places(self, query_type: str = "search", place_type: str = "all",
                     cuisine: str = None, building_id: str = None, stop_name: str = None,
                     search_term: str = None, limit: int = 5) -> Dict:
-        self._log(f"[NEO4J] find_places called: type={query_type}, place_type={place_type}, cuisine={cuisine}")
+        self._log("[NEO4J] find_places called: type=%s, place_type=%s, cuisine=%s", query_type, place_type, cuisine)
         with self.driver.session(database=self.database) as session:
             if query_type == "mensa_menu":
                 query = """
@@ -944,7 +941,7 @@ class SearchMixin:
 
     def find_places_near_building(self, building_id: str, place_type: str = "all",
                                    cuisine: str = None, radius_meters: int = 1000, limit: int = 5) -> Dict:
-        self._log(f"[NEO4J] find_places_near_building: {building_id}, type={place_type}, cuisine={cuisine}")
+        self._log("[NEO4J] find_places_near_building: %s, type=%s, cuisine=%s", building_id, place_type, cuisine)
         with self.driver.session(database=self.database) as session:
             found = self._find_building_universal(building_id, session)
             if not found:
@@ -1004,7 +1001,7 @@ class SearchMixin:
             }
 
     def find_places_by_cuisine(self, cuisine: str, place_type: str = "Restaurant", limit: int = 5) -> Dict:
-        self._log(f"[NEO4J] find_places_by_cuisine: {cuisine}")
+        self._log("[NEO4J] find_places_by_cuisine: %s", cuisine)
         with self.driver.session(database=self.database) as session:
             query = """
                 MATCH (p:POI)
@@ -1030,7 +1027,7 @@ class SearchMixin:
 
     def get_poi_info(self, poi_name: str) -> Dict:
         """Get detailed info about a POI including street, nearest stop, and building."""
-        self._log(f"[NEO4J] get_poi_info called with: '{poi_name}'")
+        self._log("[NEO4J] get_poi_info called with: '%s'", poi_name)
         search_term = poi_name.strip().lower()
         # Also create a version without spaces for matching "Worldof Pizza" style names
         search_no_spaces = search_term.replace(" ", "")
@@ -1058,7 +1055,7 @@ class SearchMixin:
                 return {"success": False, "error": f"POI '{poi_name}' not found"}
 
             poi_exact_name = find_record["name"]
-            self._log(f"[NEO4J] ✅ Found POI: {poi_exact_name}")
+            self._log("[NEO4J] ✅ Found POI: %s", poi_exact_name)
 
             # Get full POI info with relationships
             info_query = """
@@ -1099,7 +1096,7 @@ class SearchMixin:
 
     def find_places_near_coordinates(self, coords: Coordinates, place_type: str = "all",
                                       cuisine: str = None, radius_meters: int = 1000, limit: int = 5) -> Dict:
-        self._log(f"[NEO4J] find_places_near_coordinates: {coords.lat}, {coords.lon}")
+        self._log("[NEO4J] find_places_near_coordinates: %s, %s", coords.lat, coords.lon)
         with self.driver.session(database=self.database) as session:
             conditions = []
             params = {"lat": coords.lat, "lon": coords.lon, "radius": radius_meters, "limit": limit}
@@ -19,6 +19,7 @@ Embedding warmup runs in a background daemon thread on first instance
 creation (L16/L17) so the first user query doesn't block on the index.
 """
 
+import logging
 import threading
 import re
 from typing import Any, Dict, List, Optional, Tuple
@@ -30,6 +31,35 @@ from models import Coordinates
 from .thresholds import BUILDING_EXACT, STOP_EXACT, TOP_GAP_MIN
 from ._embedder import ensure_shared_encoder
 
+logger = logging.getLogger(__name__)
+
+# "building 4" / "bldg 4" / "gebäude 4", or a bare 1-2 digit query.
+# Compiled once; tried in this order, first pattern that matches wins.
+_BUILDING_ID_PATTERNS = tuple(
+    re.compile(p)
+    for p in (r"building\s*(\d+)", r"bldg\s*(\d+)", r"gebäude\s*(\d+)", r"^(\d{1,2})$")
+)
+
+# Substrings that mark a query as building-shaped (skip the ORS geocoder).
+# One compiled alternation scans the query once instead of one `in` per word.
+_BUILDING_HINT_RE = re.compile(
+    "|".join(
+        re.escape(kw)
+        for kw in (
+            "building",
+            "bldg",
+            "gebäude",
+            "faculty",
+            "department",
+            "institute",
+            "center",
+            "centre",
+            "library",
+            "mensa",
+        )
+    )
+)
+
 
 class CoordinateResolver:
 
@@ -68,7 +98,7 @@ class CoordinateResolver:
         try:
             self._initialize_cache_impl()
         except Exception as e:
-            print(f"   Warning: coordinate resolver warmup failed: {e}")
+            logger.warning(f"coordinate resolver warmup failed: {e}")
         finally:
             self._ready_event.set()
 
@@ -87,7 +117,7 @@ class CoordinateResolver:
             self._initialize_cache_impl()
 
     def _initialize_cache_impl(self) -> None:
-        print("   Building semantic search index...")
+        logger.info("Building semantic search index...")
 
         try:
             with self.neo4j_graph.driver.session(database=self.neo4j_graph.database) as session:
@@ -138,7 +168,7 @@ class CoordinateResolver:
                         "texts": building_texts,
                         "embeddings": building_embeddings,
                     }
-                    print(f"   Indexed {len(buildings)} buildings")
+                    logger.info(f"Indexed {len(buildings)} buildings")
 
                 result = session.run("""
                     MATCH (s:Stop)
@@ -174,12 +204,12 @@ class CoordinateResolver:
                         "texts": stop_texts,
                         "embeddings": stop_embeddings,
                     }
-                    print(f"   Indexed {len(stops)} stops")
+                    logger.info(f"Indexed {len(stops)} stops")
 
                 self._cache_initialized = True
 
         except Exception as e:
-            print(f"   Warning: Error building search index: {e}")
+            logger.warning(f"Error building search index: {e}")
             self._cache_initialized = False
 
     # ------------------------------------------------------------------
@@ -229,15 +259,28 @@ class CoordinateResolver:
                 **exact_stop,
             }
 
+        # Encode the query ONCE; the building and stop layers both rank
+        # against the same vector.
+        query_embedding = None
+        if self._building_cache or self._stop_cache:
+            try:
+                query_embedding = self.encoder.encode(normalized, normalize_embeddings=True)
+            except Exception as e:
+                logger.warning(f"Error encoding query: {e}")
+
         # 3. Semantic building search (with top-1/top-2 gap enforcement).
-        b_result = self._semantic_search(self._building_cache, normalized, "building", BUILDING_EXACT)
+        b_result = self._semantic_search(
+            self._building_cache, normalized, "building", BUILDING_EXACT, query_embedding
+        )
         if b_result is not None:
             b_result["query"] = original
             if b_result["resolve_method"] != "not_found":
                 return b_result
 
         # 4. Semantic stop search.
-        s_result = self._semantic_search(self._stop_cache, normalized, "stop", STOP_EXACT)
+        s_result = self._semantic_search(
+            self._stop_cache, normalized, "stop", STOP_EXACT, query_embedding
+        )
         if s_result is not None:
             s_result["query"] = original
             if s_result["resolve_method"] != "not_found":
@@ -264,7 +307,7 @@ class CoordinateResolver:
                         "lon": coords.lon,
                     }
             except Exception as e:  # ORS failure shouldn't crash the caller
-                print(f"   Warning: ORS geocode failed: {e}")
+                logger.warning(f"ORS geocode failed: {e}")
 
         return {"resolve_method": "not_found", "query": original}
 
@@ -273,14 +316,8 @@ class CoordinateResolver:
     # ------------------------------------------------------------------
 
     def _extract_building_id(self, text: str) -> Optional[str]:
-        patterns = [
-            r'building\s*(\d+)',
-            r'bldg\s*(\d+)',
-            r'gebäude\s*(\d+)',
-            r'^(\d{1,2})$',
-        ]
-        for pattern in patterns:
-            match = re.search(pattern, text)
+        for pattern in _BUILDING_ID_PATTERNS:
+            match = pattern.search(text)
             if match:
                 return match.group(1).zfill(2)
         return None
@@ -299,14 +336,14 @@ class CoordinateResolver:
                 )
                 record = result.single()
                 if record:
-                    print(f"   Found Building {building_id}: {record['name']}")
+                    logger.debug("Found Building %s: %s", building_id, record["name"])
                     return {
                         "name": record["name"],
                         "lat": record["lat"],
                         "lon": record["lon"],
                     }
         except Exception as e:
-            print(f"   Warning: Error getting building by ID: {e}")
+            logger.warning(f"Error getting building by ID: {e}")
         return None
 
     def _exact_stop_match(self, normalized: str) -> Optional[Dict[str, Any]]:
@@ -348,7 +385,7 @@ class CoordinateResolver:
                         )
 
                 if len(matches) == 1:
-                    print(f"   Found Stop: {matches[0]['name']}")
+                    logger.debug("Found Stop: %s", matches[0]["name"])
                     return matches[0]
                 if len(matches) > 1:
                     # Surface as ambiguous via resolve_detailed's caller path —
@@ -357,7 +394,7 @@ class CoordinateResolver:
                     # to semantic search which can return full ambiguous info.
                     return None
         except Exception as e:
-            print(f"   Warning: Error in exact stop match: {e}")
+            logger.warning(f"Error in exact stop match: {e}")
         return None
 
     # ------------------------------------------------------------------
@@ -370,6 +407,7 @@ class CoordinateResolver:
         query: str,
         entity_type: str,
         threshold: float,
+        query_embedding: Optional[np.ndarray] = None,
     ) -> Optional[Dict[str, Any]]:
         """Shared semantic match logic.
 
@@ -383,18 +421,26 @@ class CoordinateResolver:
 
         ``candidates`` is a list of ``{name, lat, lon, score}`` dicts ordered
         by score desc, limited to 3.
+
+        Pass ``query_embedding`` to reuse a vector already computed for
+        ``query`` (resolve_detailed encodes once for both layers).
         """
         if not cache:
             return None
 
         try:
-            query_embedding = self.encoder.encode(query, normalize_embeddings=True)
+            if query_embedding is None:
+                query_embedding = self.encoder.encode(query, normalize_embeddings=True)
             similarities = np.dot(cache["embeddings"], query_embedding)
 
             if similarities.size == 0:
                 return {"resolve_method": "not_found"}
 
-            order = np.argsort(similarities)[::-1]
+            # Only the top 3 are ever used: partition them out in O(n) and
+            # sort just those, instead of argsorting every candidate.
+            k = min(3, similarities.size)
+            top = np.argpartition(-similarities, k - 1)[:k]
+            order = top[np.argsort(-similarities[top])]
             best_idx = int(order[0])
             best_score = float(similarities[best_idx])
             second_score = float(similarities[int(order[1])]) if similarities.size > 1 else 0.0
@@ -404,23 +450,25 @@ class CoordinateResolver:
 
             top3_idx = [int(i) for i in order[:3]]
             candidates: List[Dict[str, Any]] = []
+            # Index entries are built in _initialize_cache_impl with fixed
+            # name/lat/lon keys, so they are read directly below.
             key = "buildings" if entity_type == "building" else "stops"
             for i in top3_idx:
                 item = cache[key][i]
                 candidates.append(
                     {
-                        "name": item.get("name"),
-                        "lat": item.get("lat"),
-                        "lon": item.get("lon"),
+                        "name": item["name"],
+                        "lat": item["lat"],
+                        "lon": item["lon"],
                         "score": float(similarities[i]),
                     }
                 )
 
             gap = best_score - second_score
             if gap < TOP_GAP_MIN:
-                print(
-                    f"   Ambiguous {entity_type} (top={best_score:.2f}, "
-                    f"gap={gap:.2f} < {TOP_GAP_MIN}); returning candidates"
+                logger.debug(
+                    "Ambiguous %s (top=%.2f, gap=%.2f < %s); returning candidates",
+                    entity_type, best_score, gap, TOP_GAP_MIN,
                 )
                 return {
                     "resolve_method": "ambiguous",
@@ -432,23 +480,23 @@ class CoordinateResolver:
                 }
 
             best = cache[key][best_idx]
-            print(
-                f"   Found {entity_type} (semantic, {best_score:.2f}, "
-                f"gap={gap:.2f}): {best.get('name')}"
+            logger.debug(
+                "Found %s (semantic, %.2f, gap=%.2f): %s",
+                entity_type, best_score, gap, best["name"],
             )
             return {
                 "resolve_method": "semantic",
                 "type": entity_type,
-                "name": best.get("name"),
-                "lat": best.get("lat"),
-                "lon": best.get("lon"),
+                "name": best["name"],
+                "lat": best["lat"],
+                "lon": best["lon"],
                 "score": best_score,
                 "gap": gap,
                 "candidates": candidates,
             }
 
         except Exception as e:
-            print(f"   Warning: Error in semantic {entity_type} search: {e}")
+            logger.warning(f"Error in semantic {entity_type} search: {e}")
             return None
 
     # Thin back-compat wrappers — retained in case external modules imported them.
@@ -469,19 +517,7 @@ class CoordinateResolver:
         return None
 
     def _is_likely_building(self, normalized: str, original: str) -> bool:
-        building_keywords = [
-            "building",
-            "bldg",
-            "gebäude",
-            "faculty",
-            "department",
-            "institute",
-            "center",
-            "centre",
-            "library",
-            "mensa",
-        ]
-        return any(kw in normalized for kw in building_keywords)
+        return _BUILDING_HINT_RE.search(normalized) is not None
 
 
 _resolver_instance: Optional[CoordinateResolver] = None
@@ -8,6 +8,9 @@ Composite key (H1, H13):
   sharing the same bucket, so User A's answer cannot leak into User B's
   session and "nearest parking" at location A is not reused at location B.
 
+Exact repeats (same query text in the same bucket) are answered from a
+key -> row index before the query is embedded, so they skip the encoder.
+
 Design decision — high threshold (0.95 default):
   "Where is Building 40?" vs "Where is Building 18?" score ~0.90-0.93 rejected.
   "Where is Building 40?" vs "Where's Building 40?" score ~0.97+ accepted.
@@ -17,7 +20,6 @@ Design decision — high threshold (0.95 default):
 import hashlib
 import threading
 import time
-from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
@@ -31,11 +33,20 @@ from ._embedder import ensure_shared_encoder, get_shared_encoder
 
 _ANON_USER = "__anon__"
 
+# (epoch hour, formatted string). The string only changes once an hour, so
+# every get()/put() within that hour is an integer compare, not a strftime.
+_date_hour_cache: Tuple[int, str] = (-1, "")
+
 
 def _date_hour() -> str:
     """UTC date-hour string, used as a coarse freshness component of the key."""
-    now = datetime.now(timezone.utc)
-    return now.strftime("%Y-%m-%d-%H")
+    global _date_hour_cache
+    hour = int(time.time()) // 3600
+    cached = _date_hour_cache
+    if cached[0] != hour:
+        cached = (hour, time.strftime("%Y-%m-%d-%H", time.gmtime(hour * 3600)))
+        _date_hour_cache = cached
+    return cached[1]
 
 
 def _bucket_key(
@@ -82,6 +93,13 @@ class SemanticCache:
         self._buckets: List[tuple] = []
         self._keys: List[str] = []
         self._access_order: List[int] = []
+        # Row-stacked mirror of _embeddings: one (max_size, dim) buffer
+        # allocated on the first put. put() writes its row in place and
+        # _rebuild() compacts the kept rows, so get() never re-stacks.
+        self._matrix: Optional[np.ndarray] = None
+        # _keys -> row for the exact-match path. put() adds its row; only
+        # _rebuild() (purge / eviction compaction) remaps it.
+        self._rows_by_key: Dict[str, int] = {}
 
         self._hits = 0
         self._misses = 0
@@ -103,9 +121,18 @@ class SemanticCache:
         and no cross-location leaks are possible.
         """
         bucket = _bucket_key(user_id, location)
+        key = _hash_composite(query, bucket)
+        now = time.time()
+
+        # Exact-match fast path: no embedding needed.
+        with self._lock:
+            if self._keys:
+                idx = self._rows_by_key.get(key)
+                if idx is not None and now - self._timestamps[idx] <= self._ttl:
+                    return self._hit(idx)
+
         query_embedding = self._encoder.encode(query, normalize_embeddings=True)
 
-        now = time.time()
         with self._lock:
             if not self._embeddings:
                 self._misses += 1
@@ -117,8 +144,7 @@ class SemanticCache:
                 self._misses += 1
                 return None
 
-            matrix = np.stack([self._embeddings[i] for i in candidate_idxs])
-            similarities = matrix @ query_embedding
+            similarities = self._matrix[candidate_idxs] @ query_embedding
 
             local_best = int(np.argmax(similarities))
             best_idx = candidate_idxs[local_best]
@@ -133,12 +159,7 @@ class SemanticCache:
                 self._misses += 1
                 return None
 
-            if best_idx in self._access_order:
-                self._access_order.remove(best_idx)
-            self._access_order.append(best_idx)
-
-            self._hits += 1
-            return dict(self._values[best_idx])
+            return self._hit(best_idx)
 
     def put(
         self,
@@ -168,6 +189,12 @@ class SemanticCache:
             self._buckets.append(bucket)
             self._keys.append(key)
             self._access_order.append(new_idx)
+            if self._matrix is None:
+                self._matrix = np.empty(
+                    (self._max_size, embedding.shape[-1]), dtype=embedding.dtype
+                )
+            self._matrix[new_idx] = embedding
+            self._rows_by_key[key] = new_idx
 
     # Alias expected by some call sites / tests.
     def set(self, *args, **kwargs) -> None:
@@ -186,6 +213,7 @@ class SemanticCache:
                 self._buckets.clear()
                 self._keys.clear()
                 self._access_order.clear()
+                self._rows_by_key.clear()
                 return removed
 
             keep = [
@@ -209,12 +237,22 @@ class SemanticCache:
     # Internal helpers — all assume self._lock is held
     # ------------------------------------------------------------------
 
+    def _hit(self, idx: int) -> Dict[str, Any]:
+        if idx in self._access_order:
+            self._access_order.remove(idx)
+        self._access_order.append(idx)
+        self._hits += 1
+        return dict(self._values[idx])
+
     def _purge_expired(self) -> None:
-        now = time.time()
-        valid = [i for i, ts in enumerate(self._timestamps) if now - ts <= self._ttl]
-        if len(valid) == len(self._embeddings):
+        if not self._timestamps:
             return
-        self._rebuild(valid)
+        # One vectorised comparison over every entry's age (runs on each put).
+        ts = np.fromiter(self._timestamps, dtype=np.float64, count=len(self._timestamps))
+        valid = np.flatnonzero(time.time() - ts <= self._ttl)
+        if valid.size == len(self._embeddings):
+            return
+        self._rebuild(valid.tolist())
 
     def _remove_index(self, idx: int) -> None:
         valid = [i for i in range(len(self._embeddings)) if i != idx]
@@ -232,6 +270,7 @@ class SemanticCache:
         new_timestamps = [self._timestamps[i] for i in keep_indices]
         new_buckets = [self._buckets[i] for i in keep_indices]
         new_keys = [self._keys[i] for i in keep_indices]
+        new_rows_by_key = {k: i for i, k in enumerate(new_keys)}
         new_access_order = [
             old_to_new[i] for i in self._access_order if i in keep_set
         ]
@@ -243,6 +282,10 @@ class SemanticCache:
             self._buckets = new_buckets
             self._keys = new_keys
             self._access_order = new_access_order
+            if self._matrix is not None and keep_indices:
+                # Fancy indexing copies first, so the overlapping write is safe.
+                self._matrix[:len(keep_indices)] = self._matrix[keep_indices]
+            self._rows_by_key = new_rows_by_key
 
 
 # Re-export so callers can reach the shared encoder helpers via semantic_cache
@@ -0,0 +1,48 @@
+"""Tests for FIWAREClient.aquery_sensor_by_coordinates with a mocked 200 response."""
+
+import asyncio
+import json
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from clients import fiware_client
+from clients.fiware_client import FIWAREClient
+
+# Magdeburg city centre — inside the client's bounds check.
+_LAT, _LON = 52.1205, 11.6276
+
+
+def _ok_response(body):
+    return SimpleNamespace(
+        status_code=200,
+        content=json.dumps(body).encode(),
+        text=json.dumps(body),
+        url="http://fiware.test/v2/entities",
+    )
+
+
+class QuerySensorByCoordinatesTest(unittest.TestCase):
+    def _query(self, body, sensor_type="Parking"):
+        client = FIWAREClient("http://fiware.test/v2", "test-key")
+        with mock.patch.object(FIWAREClient, "_async_client", return_value=mock.Mock()), \
+                mock.patch.object(fiware_client, "_aretry_call",
+                                  mock.AsyncMock(return_value=_ok_response(body))):
+            return asyncio.run(client.aquery_sensor_by_coordinates(_LAT, _LON, sensor_type))
+
+    def test_returns_nearest_entity(self):
+        entity = {"id": "urn:ngsi-ld:Parking:001", "type": "Parking", "freeSpaces": 12}
+        result = self._query([entity])
+        self.assertTrue(result["success"])
+        self.assertEqual(result["entity_type"], "Parking")
+        self.assertEqual(result["entity"], entity)
+        self.assertEqual(result["query_location"], {"latitude": _LAT, "longitude": _LON})
+
+    def test_empty_result_names_sensor_type(self):
+        result = self._query([], sensor_type="Weather")
+        self.assertFalse(result["success"])
+        self.assertIn("No Weather sensor found within 500m", result["error"])
+
+
+if __name__ == "__main__":
+    unittest.main()